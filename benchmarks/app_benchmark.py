@@ -0,0 +1,378 @@
+# benchmarks/app_benchmark.py
+
+import argparse
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.common import configure_environment
+
+PASSWORD = "benchmark"
+NEW_PASSWORD = "benchmark-new"
+
+_query_counter: contextvars.ContextVar[list | None] = contextvars.ContextVar("benchmark_query_counter", default=None)
+
+def _count_query(*_):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+def seed(users: int, portfolios: int, reserved: int, reserved_portfolios: int) -> dict:
+    from sqlalchemy import insert, select
+    from core.database import SessionLocal
+    from core.security import hash_password
+    from migrations import run_migrations
+    from models.portfolio import Portfolio
+    from models.user import User
+
+    run_migrations()
+    password = hash_password(PASSWORD)
+
+    def user_row(name: str, is_admin: bool = False) -> dict:
+        return {
+            "first_name": "Bench", "last_name": "User", "username": name, "email": f"{name}@example.com",
+            "password": password, "is_admin": is_admin, "is_verified": True
+        }
+
+    with SessionLocal() as db:
+        db.execute(insert(User), [user_row("admin", is_admin=True), user_row("keeper")])
+        db.execute(insert(User), [user_row(f"user{index}") for index in range(users)])
+        if reserved:
+            db.execute(insert(User), [user_row(f"reserved{index}") for index in range(reserved)])
+        db.commit()
+
+        accounts = {username: (user_id, email) for user_id, username, email in db.execute(
+            select(User.id, User.username, User.email)
+        )}
+        user_ids = [accounts[f"user{index}"][0] for index in range(users)]
+        reserved_ids = [accounts[f"reserved{index}"][0] for index in range(reserved)]
+        keeper_id = accounts["keeper"][0]
+
+        for start in range(0, portfolios, 10_000):
+            db.execute(insert(Portfolio), [
+                {
+                    "title": f"Portfolio {index} fastapi dashboard",
+                    "description": f"Benchmark portfolio {index} for react and postgres",
+                    "detail": "lorem ipsum dolor sit amet " * 40,
+                    "link": f"https://example.com/{index}",
+                    "user_id": user_ids[index % users],
+                }
+                for index in range(start, min(start + 10_000, portfolios))
+            ])
+        if reserved_portfolios:
+            db.execute(insert(Portfolio), [
+                {"title": f"Reserved {index}", "description": "reserved", "user_id": keeper_id}
+                for index in range(reserved_portfolios)
+            ])
+        db.commit()
+
+        owned: dict[int, list[int]] = {}
+        for portfolio_id, user_id in db.execute(select(Portfolio.id, Portfolio.user_id).order_by(Portfolio.id)):
+            owned.setdefault(user_id, []).append(portfolio_id)
+
+    return {
+        "accounts": accounts, "user_ids": user_ids, "reserved_ids": reserved_ids,
+        "keeper_id": keeper_id, "owned": owned
+    }
+
+class Context:
+    def __init__(self, seeded: dict):
+        from core.security import create_token
+
+        self.accounts = seeded["accounts"]
+        self.user_ids = seeded["user_ids"]
+        self.owned = seeded["owned"]
+        self._reserved = iter(seeded["reserved_ids"])
+        self.keeper_id = seeded["keeper_id"]
+        self._reserved_portfolios = iter(self.owned.get(self.keeper_id, []))
+        self._unique = itertools.count()
+        self._create_token = create_token
+        self.usernames = {user_id: username for username, (user_id, _) in self.accounts.items()}
+        self.admin_id = self.accounts["admin"][0]
+        self._access_tokens: dict[int, str] = {}
+
+    def token(self, user_id: int, token_type: str = "access") -> str:
+        username = self.usernames[user_id]
+        payload = {"user_id": user_id, "email": self.accounts[username][1], "username": username}
+        return self._create_token(payload, token_type=token_type)
+
+    def auth(self, user_id: int) -> dict:
+        if user_id not in self._access_tokens:
+            self._access_tokens[user_id] = self.token(user_id)
+        return {"Authorization": f"Bearer {self._access_tokens[user_id]}"}
+
+    def user(self, index: int) -> int:
+        return self.user_ids[index % len(self.user_ids)]
+
+    def portfolio_of(self, user_id: int) -> int:
+        return self.owned[user_id][0]
+
+    def reserved_user(self) -> int:
+        return next(self._reserved)
+
+    def reserved_portfolio(self) -> int:
+        return next(self._reserved_portfolios)
+
+    def unique(self, prefix: str) -> str:
+        return f"{prefix}{next(self._unique)}"
+
+def _register(ctx: Context, _: int) -> dict:
+    name = ctx.unique("new")
+    return {"method": "POST", "url": "/auth/register", "json": {
+        "first_name": "Bench", "last_name": "User", "username": name,
+        "email": f"{name}@example.com", "password": PASSWORD
+    }}
+
+def _admin_create(ctx: Context, _: int) -> dict:
+    name = ctx.unique("adm")
+    return {"method": "POST", "url": "/admin/users", "headers": ctx.auth(ctx.admin_id), "json": {
+        "first_name": "Bench", "last_name": "Admin", "username": name,
+        "email": f"{name}@example.com", "password": PASSWORD
+    }}
+
+SCENARIOS = {
+    "POST /auth/register": (_register, {201}),
+    "GET /auth/verify-email": (lambda ctx, i: {
+        "method": "GET", "url": "/auth/verify-email",
+        "params": {"token": ctx.token(ctx.user(i), token_type="email_verify")}
+    }, {200}),
+    "POST /auth/login": (lambda ctx, i: {
+        "method": "POST", "url": "/auth/login",
+        "json": {"username_or_email": ctx.usernames[ctx.user(i)], "password": PASSWORD}
+    }, {200}),
+    "POST /auth/forgot-password": (lambda ctx, i: {
+        "method": "POST", "url": "/auth/forgot-password",
+        "params": {"email": ctx.accounts[ctx.usernames[ctx.user(i)]][1]}
+    }, {200}),
+    "POST /auth/reset-password": (lambda ctx, i: {
+        "method": "POST", "url": "/auth/reset-password",
+        "params": {"token": ctx.token(ctx.reserved_user(), token_type="password_reset"), "new_password": NEW_PASSWORD}
+    }, {200}),
+    "POST /auth/change-password": (lambda ctx, i: {
+        "method": "POST", "url": "/auth/change-password",
+        "params": {"current_password": PASSWORD, "new_password": NEW_PASSWORD},
+        "headers": ctx.auth(ctx.reserved_user())
+    }, {200}),
+    "GET /users/me": (lambda ctx, i: {"method": "GET", "url": "/users/me", "headers": ctx.auth(ctx.user(i))}, {200}),
+    "PUT /users/me": (lambda ctx, i: {
+        "method": "PUT", "url": "/users/me", "json": {"first_name": f"Bench{i}"}, "headers": ctx.auth(ctx.user(i))
+    }, {200}),
+    "POST /users/request-delete": (lambda ctx, i: {
+        "method": "POST", "url": "/users/request-delete", "headers": ctx.auth(ctx.user(i))
+    }, {200}),
+    "GET /users/confirm-delete": (lambda ctx, i: {
+        "method": "GET", "url": "/users/confirm-delete",
+        "params": {"token": ctx.token(ctx.reserved_user(), token_type="account_delete")}
+    }, {200}),
+    "GET /users/{username}": (lambda ctx, i: {
+        "method": "GET", "url": f"/users/{ctx.usernames[ctx.user(i)]}"
+    }, {200}),
+    "GET /users/{username}/profile": (lambda ctx, i: {
+        "method": "GET", "url": f"/users/{ctx.usernames[ctx.user(i)]}/profile", "params": {"limit": 20}
+    }, {200}),
+    "POST /portfolios/": (lambda ctx, i: {
+        "method": "POST", "url": "/portfolios/", "headers": ctx.auth(ctx.user(i)),
+        "json": {"title": f"Created {i}", "description": "benchmark"}
+    }, {201}),
+    "POST /portfolios/batch": (lambda ctx, i: {
+        "method": "POST", "url": "/portfolios/batch", "headers": ctx.auth(ctx.user(i)),
+        "json": [{"title": f"Batch {i}-{n}", "description": "benchmark"} for n in range(10)]
+    }, {200}),
+    "PUT /portfolios/batch": (lambda ctx, i: {
+        "method": "PUT", "url": "/portfolios/batch", "headers": ctx.auth(ctx.user(i)),
+        "json": [{"id": portfolio_id, "link": f"https://example.com/b{i}"} for portfolio_id in ctx.owned[ctx.user(i)][:10]]
+    }, {200}),
+    "DELETE /portfolios/batch": (lambda ctx, i: {
+        "method": "DELETE", "url": "/portfolios/batch", "headers": ctx.auth(ctx.keeper_id),
+        "json": {"ids": [ctx.reserved_portfolio() for _ in range(5)]}
+    }, {200}),
+    "GET /portfolios/my_portfolios": (lambda ctx, i: {
+        "method": "GET", "url": "/portfolios/my_portfolios", "headers": ctx.auth(ctx.user(i))
+    }, {200}),
+    "GET /portfolios/all_portfolios": (lambda ctx, i: {
+        "method": "GET", "url": "/portfolios/all_portfolios", "params": {"limit": 50}
+    }, {200}),
+    "GET /portfolios/search": (lambda ctx, i: {
+        "method": "GET", "url": "/portfolios/search", "params": {"q": "fastapi dashboard", "limit": 20}
+    }, {200}),
+    "GET /portfolios/{id}": (lambda ctx, i: {
+        "method": "GET", "url": f"/portfolios/{ctx.portfolio_of(ctx.user(i))}"
+    }, {200}),
+    "PUT /portfolios/{id}": (lambda ctx, i: {
+        "method": "PUT", "url": f"/portfolios/{ctx.portfolio_of(ctx.user(i))}", "headers": ctx.auth(ctx.user(i)),
+        "json": {"title": f"Updated {i}"}
+    }, {200}),
+    "DELETE /portfolios/{id}": (lambda ctx, i: {
+        "method": "DELETE", "url": f"/portfolios/{ctx.reserved_portfolio()}", "headers": ctx.auth(ctx.keeper_id)
+    }, {204}),
+    "DELETE /admin/portfolios/{id}": (lambda ctx, i: {
+        "method": "DELETE", "url": f"/admin/portfolios/{ctx.reserved_portfolio()}", "headers": ctx.auth(ctx.admin_id)
+    }, {204}),
+    "GET /portfolios/user/{id}": (lambda ctx, i: {
+        "method": "GET", "url": f"/portfolios/user/{ctx.user(i)}"
+    }, {200}),
+    "GET /admin/users": (lambda ctx, i: {"method": "GET", "url": "/admin/users", "headers": ctx.auth(ctx.admin_id)}, {200}),
+    "POST /admin/users": (_admin_create, {201}),
+    "PUT /admin/users/{id}": (lambda ctx, i: {
+        "method": "PUT", "url": f"/admin/users/{ctx.user(i)}", "headers": ctx.auth(ctx.admin_id),
+        "json": {"last_name": f"Admin{i}"}
+    }, {200}),
+    "DELETE /admin/users/{id}": (lambda ctx, i: {
+        "method": "DELETE", "url": f"/admin/users/{ctx.reserved_user()}", "headers": ctx.auth(ctx.admin_id)
+    }, {204}),
+    "GET /admin/portfolios/{user_id}": (lambda ctx, i: {
+        "method": "GET", "url": f"/admin/portfolios/{ctx.user(i)}", "headers": ctx.auth(ctx.admin_id)
+    }, {200}),
+    "PUT /admin/portfolios/{id}": (lambda ctx, i: {
+        "method": "PUT", "url": f"/admin/portfolios/{ctx.portfolio_of(ctx.user(i))}", "headers": ctx.auth(ctx.admin_id),
+        "json": {"description": f"Admin {i}"}
+    }, {200}),
+    "POST /admin/portfolios/batch": (lambda ctx, i: {
+        "method": "POST", "url": "/admin/portfolios/batch", "headers": ctx.auth(ctx.admin_id),
+        "json": [{"title": f"Admin {i}-{n}", "description": "benchmark", "user_id": ctx.user(i)} for n in range(10)]
+    }, {200}),
+}
+
+CONSUMING = {
+    "POST /auth/reset-password": "users", "POST /auth/change-password": "users",
+    "GET /users/confirm-delete": "users", "DELETE /admin/users/{id}": "users",
+    "DELETE /portfolios/batch": "portfolios", "DELETE /portfolios/{id}": "portfolios",
+    "DELETE /admin/portfolios/{id}": "portfolios",
+}
+
+PORTFOLIOS_PER_REQUEST = {"DELETE /portfolios/batch": 5}
+
+def _percentile(timings: list[float], percent: float) -> float:
+    index = max(int(round(len(timings) * percent / 100)) - 1, 0)
+    return timings[min(index, len(timings) - 1)]
+
+async def run_scenario(client, ctx: Context, name: str, requests: int, concurrency: int) -> dict:
+    build, expected = SCENARIOS[name]
+    indexes = iter(range(requests))
+    timings: list[float] = []
+    queries: list[int] = []
+    errors: dict[str, int] = {}
+
+    async def worker():
+        for index in indexes:
+            request = build(ctx, index)
+            counter = [0]
+            token = _query_counter.set(counter)
+            started = time.perf_counter()
+            try:
+                response = await client.request(**request)
+            finally:
+                _query_counter.reset(token)
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(counter[0])
+            if response.status_code not in expected:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(_percentile(timings, 95), 3),
+        "p99_ms": round(_percentile(timings, 99), 3),
+        "throughput_rps": round(len(timings) / elapsed, 1),
+        "queries_per_request": round(statistics.mean(queries), 2),
+    }
+
+async def run(names: list[str], ctx: Context, requests: int, concurrency: int) -> dict:
+    import httpx
+    from sqlalchemy import event
+    from core.database import async_engine
+    from main import app
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _count_query)
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name in names:
+                results[name] = await run_scenario(client, ctx, name, requests, concurrency)
+    return results
+
+def compare(report: dict, baseline: dict, threshold: float) -> dict:
+    comparison = {}
+    for name, current in report["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if not previous:
+            continue
+        delta = {
+            key: round((current[key] - previous[key]) / previous[key] * 100, 1) if previous[key] else None
+            for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+        }
+        delta["queries_per_request"] = round(current["queries_per_request"] - previous["queries_per_request"], 2)
+        delta["regression"] = bool(
+            (delta["p95_ms"] is not None and delta["p95_ms"] > threshold)
+            or delta["queries_per_request"] > 0
+        )
+        comparison[name] = delta
+    return comparison
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process latency benchmark for every API route")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--portfolios", type=int, default=5_000)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--routes", default="", help="comma separated route names (default: all)")
+    parser.add_argument("--output", help="write the JSON report to this file (e.g. a new baseline)")
+    parser.add_argument("--baseline", help="compare against a previously saved report")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p95 regression in percent")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.routes.split(",") if name.strip()] or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)}")
+
+    reserved_users = args.requests * sum(
+        1 for name, kind in CONSUMING.items() if name in names and kind == "users"
+    )
+    reserved_portfolios = args.requests * sum(
+        PORTFOLIOS_PER_REQUEST.get(name, 1) for name, kind in CONSUMING.items() if name in names and kind == "portfolios"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(os.path.join(directory, "app_benchmark.db"))
+
+        started = time.perf_counter()
+        ctx = Context(seed(args.users, args.portfolios, reserved_users, reserved_portfolios))
+        seed_seconds = time.perf_counter() - started
+
+        report = {
+            "config": {
+                "users": args.users, "portfolios": args.portfolios,
+                "requests": args.requests, "concurrency": args.concurrency,
+                "seed_seconds": round(seed_seconds, 2),
+            },
+            "routes": asyncio.run(run(names, ctx, args.requests, args.concurrency)),
+        }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as file:
+            report["comparison"] = compare(report, json.load(file), args.threshold)
+        exit_code = int(any(delta["regression"] for delta in report["comparison"].values()))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    print(json.dumps(report, indent=2))
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+# benchmarks/common.py
+
+import os
+
+def configure_environment(database_path: str):
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    for key, value in {
+        "SECRET_KEY": "benchmark", "ALGORITHM": "HS256", "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+        "SMTP_SERVER": "localhost", "SMTP_PORT": "25", "EMAIL_DISPATCHER_ENABLED": "false",
+        "RATE_LIMIT_ENABLED": "false", "QUERY_BUDGET_MODE": "warn",
+    }.items():
+        os.environ.setdefault(key, value)
@@ -0,0 +1,106 @@
+# benchmarks/search_benchmark.py
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.common import configure_environment
+
+TOPICS = [
+    "fastapi", "react", "kotlin", "android", "postgres", "sqlite", "docker", "kubernetes",
+    "machine", "learning", "portfolio", "backend", "frontend", "dashboard", "analytics", "mobile",
+]
+
+def _sentence(rng: random.Random, vocabulary: list[str], words: int) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+def seed(rows: int, users: int, seed_value: int):
+    from sqlalchemy import insert
+    from core.database import engine
+    from core.security import hash_password
+    from migrations import run_migrations
+    from models.user import User
+    from models.portfolio import Portfolio
+
+    run_migrations()
+    rng = random.Random(seed_value)
+    vocabulary = TOPICS + [f"w{index}" for index in range(5000)]
+    password = hash_password("benchmark")
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {
+                "first_name": "Bench", "last_name": "User", "username": f"user{index}",
+                "email": f"user{index}@example.com", "password": password, "is_verified": True
+            }
+            for index in range(users)
+        ])
+
+    for start in range(0, rows, 10_000):
+        batch = [
+            {
+                "title": _sentence(rng, vocabulary, 4),
+                "description": _sentence(rng, vocabulary, 12),
+                "detail": _sentence(rng, vocabulary, 120),
+                "link": None,
+                "user_id": rng.randint(1, users),
+            }
+            for _ in range(start, min(start + 10_000, rows))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(Portfolio), batch)
+
+async def measure(queries: list[str], iterations: int, limit: int) -> dict:
+    from core.database import AsyncSessionLocal, async_engine
+    from helpers.search import search_portfolio_hits
+
+    results = {}
+    async with AsyncSessionLocal() as db:
+        for query in queries:
+            timings = []
+            hits = 0
+            for _ in range(iterations):
+                started = time.perf_counter()
+                hits = len(await search_portfolio_hits(db, query, limit, 0))
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            results[query] = {
+                "hits": hits,
+                "p50_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+                "max_ms": round(timings[-1], 3),
+            }
+    await async_engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio full-text search latency benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(os.path.join(directory, "search_benchmark.db"))
+
+        started = time.perf_counter()
+        seed(args.rows, args.users, args.seed)
+        seed_seconds = time.perf_counter() - started
+
+        queries = ["fastapi", "react dashboard", "w42", "mach", "kotlin android mobile"]
+        report = {
+            "rows": args.rows,
+            "seed_seconds": round(seed_seconds, 2),
+            "queries": asyncio.run(measure(queries, args.iterations, args.limit)),
+        }
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
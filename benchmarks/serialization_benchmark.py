@@ -0,0 +1,129 @@
+# benchmarks/serialization_benchmark.py
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.common import configure_environment
+from benchmarks.search_benchmark import seed
+
+FULL_FIELDS = "title,description,detail,link,created_at,updated_at,user.username,user.email"
+
+def _timed(func, iterations: int) -> dict:
+    func()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+    }
+
+def measure_serializers(limit: int, iterations: int) -> dict:
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import EmailStr, TypeAdapter
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload
+    from core.database import SessionLocal
+    from core.responses import dumps_json
+    from helpers.projection import parse_portfolio_fields, portfolio_load_options, project_portfolio
+    from models.portfolio import Portfolio
+    from schemas.portfolio_schema import PortfolioDetailResponse, PortfolioListItem, PortfolioUserResponse
+
+    class LegacyUser(PortfolioUserResponse):
+        email: EmailStr
+
+    class LegacyDetail(PortfolioDetailResponse):
+        user: LegacyUser
+
+    projection = parse_portfolio_fields(FULL_FIELDS, include_user=True)
+    with SessionLocal() as db:
+        full_rows = db.scalars(
+            select(Portfolio).options(joinedload(Portfolio.user)).order_by(Portfolio.created_at, Portfolio.id).limit(limit)
+        ).all()
+        projected_rows = db.scalars(
+            select(Portfolio).options(*portfolio_load_options(*projection))
+            .order_by(Portfolio.created_at, Portfolio.id).limit(limit)
+        ).all()
+        legacy = TypeAdapter(list[LegacyDetail])
+        detail = TypeAdapter(list[PortfolioDetailResponse])
+        compact = TypeAdapter(list[PortfolioListItem])
+
+        def projected():
+            return [project_portfolio(portfolio, *projection) for portfolio in projected_rows]
+
+        return {
+            "legacy_encoder": _timed(
+                lambda: json.dumps(jsonable_encoder(legacy.validate_python(full_rows, from_attributes=True))).encode(),
+                iterations
+            ),
+            "legacy_dump_json": _timed(
+                lambda: legacy.dump_json(legacy.validate_python(full_rows, from_attributes=True)), iterations
+            ),
+            "detail_dump_json": _timed(
+                lambda: detail.dump_json(detail.validate_python(full_rows, from_attributes=True)), iterations
+            ),
+            "compact_dump_json": _timed(
+                lambda: compact.dump_json(compact.validate_python(projected()), exclude_unset=True), iterations
+            ),
+            "direct_json": _timed(lambda: dumps_json(projected()), iterations),
+        }
+
+async def measure_endpoint(limit: int, iterations: int) -> dict:
+    import httpx
+    from core.database import async_engine
+    from main import app
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, fields in (("default_fields", None), ("all_fields", FULL_FIELDS)):
+            params = {"limit": limit}
+            if fields:
+                params["fields"] = fields
+            timings = []
+            size = 0
+            for _ in range(iterations + 1):
+                started = time.perf_counter()
+                response = await client.get("/portfolios/all_portfolios", params=params)
+                timings.append((time.perf_counter() - started) * 1000)
+                size = len(response.content)
+            timings = sorted(timings[1:])
+            results[name] = {
+                "bytes": size,
+                "p50_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+            }
+    await async_engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="list_all_portfolios serialization benchmark")
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(os.path.join(directory, "serialization_benchmark.db"))
+        seed(args.rows, args.users, args.seed)
+
+        report = {
+            "rows": args.rows,
+            "page_size": args.limit,
+            "serializers": measure_serializers(args.limit, args.iterations),
+            "endpoint": asyncio.run(measure_endpoint(args.limit, args.iterations)),
+        }
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/serve_benchmark.py
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.app_benchmark import SCENARIOS, Context, run_scenario, seed
+from benchmarks.common import configure_environment
+
+DEFAULT_ROUTES = (
+    "GET /portfolios/all_portfolios", "GET /portfolios/{id}", "GET /users/{username}", "POST /auth/login",
+)
+DRAIN_ROUTE = "GET /portfolios/all_portfolios"
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _command(mode: str, port: int, workers: int) -> list[str]:
+    if mode == "dev":
+        return [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--reload"]
+    return [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+
+async def _wait_ready(client, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode}")
+        try:
+            if (await client.get("/docs")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+async def _drain(client, process: subprocess.Popen, ctx: Context, concurrency: int) -> dict:
+    build, expected = SCENARIOS[DRAIN_ROUTE]
+    pending = [asyncio.create_task(client.request(**build(ctx, index))) for index in range(concurrency)]
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    process.send_signal(signal.SIGTERM)
+    responses = await asyncio.gather(*pending, return_exceptions=True)
+    await asyncio.to_thread(process.wait, 60)
+    return {
+        "in_flight": concurrency,
+        "completed": sum(1 for response in responses if not isinstance(response, Exception)
+                         and response.status_code in expected),
+        "shutdown_seconds": round(time.perf_counter() - started, 3),
+        "exit_code": process.returncode,
+    }
+
+async def run_mode(mode: str, names: list[str], ctx: Context, requests: int, concurrency: int, workers: int) -> dict:
+    import httpx
+
+    port = _free_port()
+    process = subprocess.Popen(
+        _command(mode, port, workers), cwd=os.getcwd(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            await _wait_ready(client, process)
+            routes = {}
+            for name in names:
+                result = await run_scenario(client, ctx, name, requests, concurrency)
+                result.pop("queries_per_request")
+                routes[name] = result
+            drain = await _drain(client, process, ctx, concurrency)
+        return {"routes": routes, "drain": drain}
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the dev reload server with the production serve entry point")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--portfolios", type=int, default=5_000)
+    parser.add_argument("--requests", type=int, default=500, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--modes", default="dev,serve")
+    parser.add_argument("--routes", default=",".join(DEFAULT_ROUTES))
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.routes.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(os.path.join(directory, "serve_benchmark.db"))
+        ctx = Context(seed(args.users, args.portfolios, 0, 0))
+
+        report = {
+            "config": {
+                "users": args.users, "portfolios": args.portfolios, "requests": args.requests,
+                "concurrency": args.concurrency, "workers": args.workers, "cpus": os.cpu_count(),
+            },
+            "modes": {
+                mode: asyncio.run(run_mode(mode, names, ctx, args.requests, args.concurrency, args.workers))
+                for mode in (mode.strip() for mode in args.modes.split(",") if mode.strip())
+            },
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    print(output)
+
+if __name__ == "__main__":
+    main()
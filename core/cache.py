@@ -0,0 +1,74 @@
+# core/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from core.metrics import Counter, Gauge
+
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by result", ("cache", "result"))
+
+_caches: dict = {}
+
+Gauge(
+    "cache_entries", "Entries currently held by each cache", ("cache",),
+    callback=lambda: {(name,): len(cache) for name, cache in _caches.items()}
+)
+Gauge(
+    "cache_hit_ratio", "Share of lookups answered from each cache", ("cache",),
+    callback=lambda: {(name,): cache.stats()["hit_rate"] for name, cache in _caches.items()}
+)
+
+class TTLCache:
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        _caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] <= now:
+                del self._data[key]
+                item = None
+            if item is None:
+                CACHE_REQUESTS.inc(cache=self.name, result="miss")
+                return None
+            self._data.move_to_end(key)
+        CACHE_REQUESTS.inc(cache=self.name, result="hit")
+        return item[1]
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        hits = CACHE_REQUESTS.value(cache=self.name, result="hit")
+        misses = CACHE_REQUESTS.value(cache=self.name, result="miss")
+        total = hits + misses
+        return {
+            "entries": len(self._data),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
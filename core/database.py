@@ -1,27 +1,181 @@
 # core/database.py
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from core.config import DATABASE_URL
+import itertools
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from core.config import (
+    DATABASE_URL, ASYNC_DATABASE_URL, DATABASE_REPLICA_URLS,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT_MS, SQLITE_MMAP_SIZE
+)
+from core.metrics import Counter, Gauge, Histogram
+from core.timing import record_query
 from datetime import datetime
 import pytz
 
 ISTANBUL_TZ = pytz.timezone('Europe/Istanbul')
 
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled connection", ("pool",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Connection checkouts that hit the pool timeout", ("pool",)
+)
+
+_pools: dict = {}
+
 def get_istanbul_now():
     return datetime.now(ISTANBUL_TZ)
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+class _TimedPoolMixin:
+    metrics_name = "default"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(pool=self.metrics_name)
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started, pool=self.metrics_name)
+
+def _timed_pool_class(base, name: str):
+    return type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"metrics_name": name})
+
+def _is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+def _engine_options(url: str, name: str, pool_base) -> dict:
+    options = {}
+    if make_url(url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    if not _is_sqlite_memory(url):
+        options.update(
+            poolclass=_timed_pool_class(pool_base, name),
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+    return options
+
+def _apply_sqlite_pragmas(dbapi_connection, _):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def _before_cursor_execute(conn, *_):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _query_timer(name: str):
+    def after_cursor_execute(conn, cursor, statement, *_):
+        started = conn.info.get("query_started")
+        if started:
+            record_query(name, statement, time.perf_counter() - started.pop())
+    return after_cursor_execute
+
+def _discard_query_timer(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args, future=True)
+def _register_engine(sync_engine, name: str):
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _query_timer(name))
+    event.listen(sync_engine, "handle_error", _discard_query_timer)
+    _pools[name] = sync_engine
+
+def _pool_stats() -> dict:
+    stats = {}
+    for name, sync_engine in _pools.items():
+        pool = sync_engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        stats[name] = {
+            "size": pool.size(),
+            "checked_out": checked_out,
+            "overflow": max(pool.overflow(), 0),
+            "saturation": checked_out / capacity if capacity else 0.0,
+        }
+    return stats
+
+def _pool_gauge(field: str):
+    return lambda: {(name,): values[field] for name, values in _pool_stats().items()}
+
+Gauge("db_pool_size", "Configured pool size", ("pool",), callback=_pool_gauge("size"))
+Gauge("db_pool_checked_out", "Connections currently checked out", ("pool",), callback=_pool_gauge("checked_out"))
+Gauge("db_pool_overflow", "Overflow connections currently open", ("pool",), callback=_pool_gauge("overflow"))
+Gauge("db_pool_saturation", "Checked out connections over pool capacity", ("pool",), callback=_pool_gauge("saturation"))
+
+engine = create_engine(DATABASE_URL, future=True, **_engine_options(DATABASE_URL, "sync", QueuePool))
+_register_engine(engine, "sync")
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+_async_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+async_engine = create_async_engine(_async_url, **_engine_options(_async_url, "primary", AsyncAdaptedQueuePool))
+_register_engine(async_engine.sync_engine, "primary")
+
+class PrimarySession(Session):
+    pass
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, sync_session_class=PrimarySession
+)
+
+replica_engines = []
+for _index, _replica_url in enumerate(DATABASE_REPLICA_URLS):
+    _replica_url = to_async_url(_replica_url)
+    _replica = create_async_engine(
+        _replica_url, **_engine_options(_replica_url, f"replica{_index}", AsyncAdaptedQueuePool)
+    )
+    _register_engine(_replica.sync_engine, f"replica{_index}")
+    replica_engines.append(_replica)
+
+_replica_sessions = itertools.cycle([
+    async_sessionmaker(bind=replica, autoflush=False, expire_on_commit=False) for replica in replica_engines
+])
+
+def next_read_sessionmaker():
+    return next(_replica_sessions) if replica_engines else AsyncSessionLocal
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+async def dispose_engines():
+    await async_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+    engine.dispose()
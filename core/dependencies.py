@@ -1,15 +1,60 @@
 # core/dependencies.py
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from core.database import get_db
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from core.cache import TTLCache
+from core.config import USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE
+from core.database import AsyncSessionLocal, get_db, next_read_sessionmaker, replica_engines
+from core.metrics import Counter
+from core.read_routing import reads_own_writes
 from models.user import User
-from core.security import decode_token
+from models.user_cache_invalidation import UserCacheInvalidation
+from core.security import AUTH_FAILURES, decode_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+user_cache = TTLCache("current_user", USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+
+READ_ROUTING = Counter("db_read_routing_total", "Read sessions handed out by target", ("target",))
+
+_USER_COLUMNS = tuple(column.key for column in User.__table__.columns)
+
+def invalidate_cached_user(user_id: int):
+    user_cache.pop(user_id)
+
+def _record_user_change(mapper, connection, target):
+    connection.execute(insert(UserCacheInvalidation).values(user_id=target.id))
+
+event.listen(User, "after_update", _record_user_change)
+event.listen(User, "after_delete", _record_user_change)
+
+async def get_read_db(request: Request):
+    if not replica_engines:
+        session_factory, target = AsyncSessionLocal, "primary"
+    elif reads_own_writes(request):
+        session_factory, target = AsyncSessionLocal, "primary_sticky"
+    else:
+        session_factory, target = next_read_sessionmaker(), "replica"
+    READ_ROUTING.inc(target=target)
+    async with session_factory() as db:
+        yield db
+
+async def _get_user(db: AsyncSession, user_id: int) -> User | None:
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        user = await db.get(User, user_id)
+        if user:
+            user_cache.set(user_id, {key: getattr(user, key) for key in _USER_COLUMNS})
+        return user
+
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Oturum geçersiz veya süresi dolmuş.",
@@ -23,16 +68,19 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     username: str = payload.get("username")
 
     if not user_id or not email or not username:
+        AUTH_FAILURES.inc(reason="invalid_claims")
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    user = await _get_user(db, user_id)
+    if not user or user.deleted_at is not None:
+        AUTH_FAILURES.inc(reason="unknown_user")
         raise credentials_exception
 
     if user.email != email or user.username != username:
+        AUTH_FAILURES.inc(reason="stale_session")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Kullanıcı bilgileri değişti, lütfen tekrar giriş yapın."
         )
 
-    return user
\ No newline at end of file
+    return user
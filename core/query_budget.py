@@ -0,0 +1,57 @@
+# core/query_budget.py
+
+import logging
+import re
+from core.config import QUERY_BUDGET_MODE, QUERY_BUDGET_DEFAULT, QUERY_REPEAT_THRESHOLD
+from core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_VIOLATIONS = Counter(
+    "query_budget_violations_total", "Requests that exceeded their query budget", ("route", "kind")
+)
+
+_PARAMETER_LISTS = re.compile(r"\((?:\s*(?:\?|%s|\$\d+)\s*,)+\s*(?:\?|%s|\$\d+)\s*\)")
+_PARAMETERS = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+def query_budget(max_queries: int, repeat_threshold: int | None = None):
+    def decorator(endpoint):
+        endpoint.query_budget = (max_queries, repeat_threshold)
+        return endpoint
+    return decorator
+
+def budget_for(endpoint) -> tuple[int, int]:
+    max_queries, repeat_threshold = getattr(endpoint, "query_budget", (QUERY_BUDGET_DEFAULT, None))
+    return max_queries, repeat_threshold or QUERY_REPEAT_THRESHOLD
+
+def fingerprint(statement: str) -> str:
+    statement = _PARAMETER_LISTS.sub("(?+)", statement)
+    statement = _PARAMETERS.sub("?", statement)
+    statement = _LITERALS.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+def enforce(route: str, budget: tuple[int, int], queries: int, statements: dict[str, int]):
+    max_queries, repeat_threshold = budget
+    problems = []
+
+    if queries > max_queries:
+        QUERY_BUDGET_VIOLATIONS.inc(route=route, kind="budget")
+        problems.append(f"{queries} sorgu çalıştı, bütçe {max_queries}")
+
+    for statement, count in statements.items():
+        if count >= repeat_threshold:
+            QUERY_BUDGET_VIOLATIONS.inc(route=route, kind="repeat")
+            problems.append(f"aynı sorgu {count} kez çalıştı (olası N+1): {statement[:200]}")
+
+    if not problems:
+        return
+
+    message = f"{route}: " + "; ".join(problems)
+    if QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning("Sorgu bütçesi aşıldı: %s", message)
@@ -0,0 +1,220 @@
+# core/rate_limit.py
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, Request, status
+from core.config import (
+    RATE_LIMIT_ENABLED, RATE_LIMIT_BACKEND, RATE_LIMIT_REDIS_URL, RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_LOGIN_IP, RATE_LIMIT_LOGIN_IDENTIFIER,
+    RATE_LIMIT_FORGOT_PASSWORD_IP, RATE_LIMIT_FORGOT_PASSWORD_IDENTIFIER,
+    RATE_LIMIT_REGISTER_IP, RATE_LIMIT_REGISTER_IDENTIFIER
+)
+from core.metrics import Counter
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "Requests rejected by the rate limiter", ("scope", "key")
+)
+RATE_LIMIT_BACKEND_ERRORS = Counter(
+    "rate_limit_backend_errors_total", "Rate limiter backend failures (requests were let through)", ("scope",)
+)
+
+def _sliding_retry(limit: int, window: float, now: float, previous: float, current: float) -> float:
+    elapsed = now % window
+    if current + 1 > limit:
+        return window - elapsed
+    return (1 - (limit - 1 - current) / previous) * window - elapsed
+
+class MemoryBackend:
+    def __init__(self, maxsize: int = RATE_LIMIT_MAX_KEYS):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _store(self, key: str, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def sliding_window(self, key: str, limit: int, window: float) -> float:
+        now = time.monotonic()
+        index = int(now // window)
+        with self._lock:
+            stored_index, current, previous = self._data.get(key, (index, 0, 0))
+            if stored_index == index - 1:
+                current, previous = 0, current
+            elif stored_index != index:
+                current, previous = 0, 0
+
+            if previous * (1 - (now % window) / window) + current + 1 > limit:
+                self._store(key, (index, current, previous))
+                return _sliding_retry(limit, window, now, previous, current)
+            self._store(key, (index, current + 1, previous))
+            return 0.0
+
+    async def token_bucket(self, key: str, capacity: int, period: float) -> float:
+        now = time.monotonic()
+        rate = capacity / period
+        with self._lock:
+            tokens, updated = self._data.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._store(key, (tokens - 1, now))
+                return 0.0
+            self._store(key, (tokens, now))
+            return (1 - tokens) / rate
+
+_SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local index = math.floor(now / window)
+local current_key = KEYS[1] .. ":" .. index
+local previous = tonumber(redis.call("GET", KEYS[1] .. ":" .. (index - 1)) or "0")
+local current = tonumber(redis.call("GET", current_key) or "0")
+local elapsed = now % window
+if previous * (1 - elapsed / window) + current + 1 > limit then
+    if current + 1 > limit then
+        return tostring(window - elapsed)
+    end
+    return tostring((1 - (limit - 1 - current) / previous) * window - elapsed)
+end
+redis.call("INCR", current_key)
+redis.call("EXPIRE", current_key, math.ceil(window * 2))
+return "0"
+"""
+
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local rate = capacity / period
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil(period))
+return tostring(retry)
+"""
+
+class RedisBackend:
+    def __init__(self, client, prefix: str = "ratelimit"):
+        self.client = client
+        self.prefix = prefix
+        self._sliding_window = client.register_script(_SLIDING_WINDOW_SCRIPT)
+        self._token_bucket = client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str):
+        if redis_asyncio is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis için 'redis' paketi kurulu olmalıdır.")
+        return cls(redis_asyncio.from_url(url))
+
+    async def sliding_window(self, key: str, limit: int, window: float) -> float:
+        return float(await self._sliding_window(keys=[f"{self.prefix}:sw:{key}"], args=[limit, window, time.time()]))
+
+    async def token_bucket(self, key: str, capacity: int, period: float) -> float:
+        return float(await self._token_bucket(keys=[f"{self.prefix}:tb:{key}"], args=[capacity, period, time.time()]))
+
+class SlidingWindow:
+    __slots__ = ("limit", "window")
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+
+    async def hit(self, backend, key: str) -> float:
+        return await backend.sliding_window(key, self.limit, self.window)
+
+class TokenBucket:
+    __slots__ = ("capacity", "period")
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+
+    async def hit(self, backend, key: str) -> float:
+        return await backend.token_bucket(key, self.capacity, self.period)
+
+def parse_rule(spec: str, rule_class):
+    if not spec or spec.strip() in ("0", "off"):
+        return None
+    limit, seconds = spec.split("/", 1)
+    return rule_class(int(limit), float(seconds))
+
+RATE_LIMITS = {
+    "login": (
+        parse_rule(RATE_LIMIT_LOGIN_IP, SlidingWindow),
+        parse_rule(RATE_LIMIT_LOGIN_IDENTIFIER, TokenBucket),
+    ),
+    "forgot_password": (
+        parse_rule(RATE_LIMIT_FORGOT_PASSWORD_IP, SlidingWindow),
+        parse_rule(RATE_LIMIT_FORGOT_PASSWORD_IDENTIFIER, TokenBucket),
+    ),
+    "register": (
+        parse_rule(RATE_LIMIT_REGISTER_IP, SlidingWindow),
+        parse_rule(RATE_LIMIT_REGISTER_IDENTIFIER, TokenBucket),
+    ),
+}
+
+_backend = None
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = RedisBackend.from_url(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_BACKEND == "redis" else MemoryBackend()
+    return _backend
+
+def set_backend(backend):
+    global _backend
+    _backend = backend
+
+def _identifier_key(identifier: str) -> str:
+    return hashlib.sha256(identifier.strip().lower().encode("utf-8")).hexdigest()[:32]
+
+async def enforce_rate_limit(request: Request, scope: str, identifier: str | None = None):
+    if not RATE_LIMIT_ENABLED:
+        return
+
+    ip_rule, identifier_rule = RATE_LIMITS[scope]
+    checks = []
+    if ip_rule is not None:
+        checks.append(("ip", ip_rule, f"{scope}:ip:{request.client.host if request.client else 'unknown'}"))
+    if identifier_rule is not None and identifier:
+        checks.append(("identifier", identifier_rule, f"{scope}:id:{_identifier_key(identifier)}"))
+
+    backend = get_backend()
+    for key_type, rule, key in checks:
+        try:
+            retry_after = await rule.hit(backend, key)
+        except Exception:
+            RATE_LIMIT_BACKEND_ERRORS.inc(scope=scope)
+            logger.warning("Hız sınırlayıcı arka ucuna ulaşılamadı, istek sınırlanmadan geçiriliyor", exc_info=True)
+            return
+
+        if retry_after > 0:
+            RATE_LIMIT_REJECTIONS.inc(scope=scope, key=key_type)
+            seconds = max(1, math.ceil(retry_after))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Çok fazla deneme yapıldı, lütfen {seconds} saniye sonra tekrar deneyin.",
+                headers={"Retry-After": str(seconds)},
+            )
@@ -0,0 +1,75 @@
+# core/read_routing.py
+
+import math
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from fastapi import Request
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from core.config import READ_YOUR_WRITES_SECONDS
+from core.database import PrimarySession, replica_engines
+
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+
+class _WriteMarker:
+    __slots__ = ("written_at",)
+
+    def __init__(self):
+        self.written_at = None
+
+_current: ContextVar[_WriteMarker | None] = ContextVar("write_marker", default=None)
+
+def _mark_write(session):
+    marker = _current.get()
+    if marker is not None:
+        marker.written_at = time.time()
+
+if replica_engines:
+    event.listen(PrimarySession, "after_commit", _mark_write)
+
+def _parse_write_time(value: str | None) -> float | None:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+def reads_own_writes(request: Request) -> bool:
+    written_at = _parse_write_time(request.headers.get(LAST_WRITE_HEADER))
+    if written_at is None:
+        written_at = _parse_write_time(request.cookies.get(LAST_WRITE_COOKIE))
+    return written_at is not None and 0 <= time.time() - written_at < READ_YOUR_WRITES_SECONDS
+
+def _last_write_cookie(written_at: str) -> str:
+    cookie = SimpleCookie()
+    cookie[LAST_WRITE_COOKIE] = written_at
+    cookie[LAST_WRITE_COOKIE].update({
+        "max-age": math.ceil(READ_YOUR_WRITES_SECONDS), "path": "/", "httponly": True, "samesite": "lax"
+    })
+    return cookie.output(header="").strip()
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_engines:
+            await self.app(scope, receive, send)
+            return
+
+        marker = _WriteMarker()
+        token = _current.set(marker)
+
+        async def send_with_write_time(message):
+            if message["type"] == "http.response.start" and marker.written_at is not None:
+                written_at = f"{marker.written_at:.3f}"
+                headers = MutableHeaders(scope=message)
+                headers.append(LAST_WRITE_HEADER, written_at)
+                headers.append("Set-Cookie", _last_write_cookie(written_at))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_write_time)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,36 @@
+# core/responses.py
+
+import json
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from core.config import FAST_JSON_RESPONSES
+from core.timing import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+def json_response(content, response: Response | None = None, status_code: int = 200) -> FastJSONResponse:
+    with timed("serialize"):
+        result = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        result.headers.raw.extend(response.headers.raw)
+    return result
+
+def fast_json_response(content, response: Response | None = None):
+    if not FAST_JSON_RESPONSES:
+        return content
+    return json_response(content, response)
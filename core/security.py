@@ -1,20 +1,138 @@
 # core/security.py
 
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
 from fastapi import HTTPException, status
 from jose import jwt, JWTError
 from passlib.context import CryptContext
-from core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from passlib.hash import pbkdf2_sha256
+from core.cache import TTLCache
+from core.metrics import Counter, Gauge, Histogram
+from core.timing import timed
+from core.config import (
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REQUEST_HASH_WORKERS, HASH_MAX_PENDING, IMPORT_HASH_WORKERS,
+    PASSWORD_HASH_ROUNDS, PASSWORD_HASH_TARGET_MS, TOKEN_CACHE_MAX_SIZE
+)
 from core.database import get_istanbul_now
 
+logger = logging.getLogger(__name__)
+
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
+token_cache = TTLCache("token", TOKEN_CACHE_MAX_SIZE, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+AUTH_FAILURES = Counter("auth_failures_total", "Rejected authentication attempts", ("reason",))
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds", "Password hash and verify latency including queueing", ("operation",)
+)
+
+PASSWORD_HASH_ROUNDS_GAUGE = Gauge("password_hash_rounds", "pbkdf2_sha256 rounds used for new password hashes")
+PASSWORD_REHASHES = Counter("password_rehash_total", "Password hashes upgraded on login", ("result",))
+
+_hash_executors: dict[str, ProcessPoolExecutor] = {}
+_hash_pool_sizes = {"requests": REQUEST_HASH_WORKERS, "import": IMPORT_HASH_WORKERS}
+_hash_pending = 0
+_hash_rounds = PASSWORD_HASH_ROUNDS
+
+def configure_password_rounds(rounds: int):
+    global _hash_rounds
+    _hash_rounds = rounds
+    pwd_context.update(pbkdf2_sha256__default_rounds=rounds, pbkdf2_sha256__min_rounds=rounds)
+    PASSWORD_HASH_ROUNDS_GAUGE.set(rounds)
+
+configure_password_rounds(PASSWORD_HASH_ROUNDS)
+
+def calibrate_password_rounds(target_ms: float = PASSWORD_HASH_TARGET_MS, probe_rounds: int = 10000) -> int:
+    probe = pbkdf2_sha256.using(rounds=probe_rounds)
+    elapsed = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        probe.hash("calibration")
+        elapsed = min(elapsed, time.perf_counter() - started)
+    rounds = int(probe_rounds * target_ms / 1000 / elapsed) // 1000 * 1000
+    return max(PASSWORD_HASH_ROUNDS, rounds)
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def hash_password_batch(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+def _get_hash_executor(pool: str = "requests") -> ProcessPoolExecutor:
+    executor = _hash_executors.get(pool)
+    if executor is None:
+        executor = _hash_executors[pool] = ProcessPoolExecutor(
+            max_workers=_hash_pool_sizes[pool], initializer=configure_password_rounds, initargs=(_hash_rounds,)
+        )
+    return executor
+
+async def _run_hash_job(func, *args):
+    global _hash_pending
+    if _hash_pending >= HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin.",
+            headers={"Retry-After": "1"},
+        )
+
+    _hash_pending += 1
+    started = time.perf_counter()
+    try:
+        with timed("hash"):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_pending -= 1
+        PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started, operation=func.__name__)
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hash_job(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+async def hash_passwords_async(passwords: list[str], slice_size: int = 8) -> list[str]:
+    loop = asyncio.get_running_loop()
+    executor = _get_hash_executor("import" if IMPORT_HASH_WORKERS else "requests")
+    semaphore = asyncio.Semaphore(max(1, IMPORT_HASH_WORKERS))
+
+    async def run(part: list[str]) -> list[str]:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                return await loop.run_in_executor(executor, hash_password_batch, part)
+            finally:
+                PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started, operation="hash_password_batch")
+
+    with timed("hash"):
+        parts = await asyncio.gather(*(
+            run(passwords[start:start + slice_size]) for start in range(0, len(passwords), slice_size)
+        ))
+    return [hashed for part in parts for hashed in part]
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+def calibrate_password_hashing() -> int:
+    rounds = calibrate_password_rounds()
+    os.environ["PASSWORD_HASH_ROUNDS"] = str(rounds)
+    configure_password_rounds(rounds)
+    logger.info("Şifre hash maliyeti ayarlandı: %s tur (hedef %.0f ms)", rounds, PASSWORD_HASH_TARGET_MS)
+    return rounds
+
+def shutdown_hash_executor():
+    while _hash_executors:
+        _, executor = _hash_executors.popitem()
+        executor.shutdown(wait=True, cancel_futures=True)
+
 def create_token(data: dict, token_type: str, expires_delta: timedelta = None) -> str:
     to_encode = data.copy()
     now = get_istanbul_now()
@@ -34,18 +152,30 @@ def create_token(data: dict, token_type: str, expires_delta: timedelta = None) -
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def decode_token(token: str, expected_type: str = None):
-    credentials_exception = HTTPException(
+def _token_exception() -> HTTPException:
+    AUTH_FAILURES.inc(reason="invalid_token")
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Token geçersiz veya süresi dolmuş.",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
-        if expected_type and payload.get("type") != expected_type:
-            raise credentials_exception
+def decode_token(token: str, expected_type: str = None):
+    cacheable = expected_type == "access"
+    cache_key = hashlib.sha256(token.encode()).digest() if cacheable else None
+    payload = token_cache.get(cache_key) if cacheable else None
+
+    if payload is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise _token_exception()
+
+        exp = payload.get("exp")
+        if cacheable and payload.get("type") == "access" and isinstance(exp, (int, float)):
+            token_cache.set(cache_key, payload, ttl=exp - time.time())
+
+    if expected_type and payload.get("type") != expected_type:
+        raise _token_exception()
 
-        return payload
-    except JWTError:
-        raise credentials_exception
\ No newline at end of file
+    return payload
\ No newline at end of file
@@ -0,0 +1,155 @@
+# core/timing.py
+
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from core.config import QUERY_BUDGET_MODE
+from core.metrics import Counter, Histogram
+from core.query_budget import budget_for, enforce, fingerprint
+
+PHASES = ("db", "hash", "serialize")
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "End-to-end request latency", ("method", "route")
+)
+REQUEST_PHASE_SECONDS = Histogram(
+    "http_request_phase_seconds", "Request time spent per phase", ("route", "phase")
+)
+REQUESTS = Counter("http_requests_total", "Handled HTTP requests", ("method", "route", "status"))
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Duration of individual SQL statements", ("engine",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+
+class RequestTimings:
+    __slots__ = ("route", "durations", "queries", "statements", "endpoint_finished")
+
+    def __init__(self):
+        self.route = None
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self.statements: dict[str, int] = {}
+        self.endpoint_finished = None
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+def current_timings() -> RequestTimings | None:
+    return _current.get()
+
+def add_time(phase: str, seconds: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.durations[phase] += seconds
+
+@contextmanager
+def timed(phase: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase, time.perf_counter() - started)
+
+def record_query(engine_name: str, statement: str, seconds: float):
+    DB_QUERY_SECONDS.observe(seconds, engine=engine_name)
+    timings = _current.get()
+    if timings is not None:
+        timings.durations["db"] += seconds
+        timings.queries += 1
+        if QUERY_BUDGET_MODE != "off":
+            key = fingerprint(statement)
+            timings.statements[key] = timings.statements.get(key, 0) + 1
+
+def server_timing_header(timings: RequestTimings, total: float) -> str:
+    entries = [
+        f"{phase};dur={timings.durations[phase] * 1000:.2f}" for phase in PHASES
+    ]
+    entries[0] += f';desc="{timings.queries} queries"'
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+def _mark_endpoint_finished(endpoint):
+    if getattr(endpoint, "marks_endpoint_finished", False):
+        return endpoint
+
+    def finish():
+        timings = _current.get()
+        if timings is not None:
+            timings.endpoint_finished = time.perf_counter()
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finish()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                finish()
+    wrapper.marks_endpoint_finished = True
+    return wrapper
+
+class TimedRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_endpoint_finished(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route_path = self.path_format
+        budget = budget_for(self.endpoint)
+
+        async def timed_handler(request):
+            timings = _current.get()
+            if timings is None:
+                return await handler(request)
+
+            timings.route = route_path
+            response = await handler(request)
+            if timings.endpoint_finished is not None:
+                timings.durations["serialize"] += time.perf_counter() - timings.endpoint_finished
+            if QUERY_BUDGET_MODE != "off":
+                enforce(route_path, budget, timings.queries, timings.statements)
+            return response
+
+        return timed_handler
+
+class TimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing_header(timings, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            total = time.perf_counter() - started
+            route = timings.route or "other"
+            REQUEST_SECONDS.observe(total, method=scope["method"], route=route)
+            REQUESTS.inc(method=scope["method"], route=route, status=status_code)
+            for phase in PHASES:
+                REQUEST_PHASE_SECONDS.observe(timings.durations[phase], route=route, phase=phase)
+            _current.reset(token)
@@ -0,0 +1,91 @@
+# helpers/account_purge.py
+
+import asyncio
+import logging
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import ACCOUNT_SOFT_DELETE, ACCOUNT_PURGE_BATCH_SIZE, ACCOUNT_PURGE_INTERVAL
+from core.database import AsyncSessionLocal, get_istanbul_now
+from core.dependencies import invalidate_cached_user
+from core.metrics import Counter
+from models.portfolio import Portfolio
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+PURGED_ROWS = Counter("account_purge_rows_total", "Rows removed by the background account purge", ("table",))
+
+async def remove_account(db: AsyncSession, user: User):
+    if ACCOUNT_SOFT_DELETE:
+        user.deleted_at = get_istanbul_now()
+    else:
+        await db.delete(user)
+
+class AccountPurger:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    def notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                purged = await self.purge_once()
+            except Exception:
+                logger.exception("Silinen hesaplar temizlenemedi")
+                purged = 0
+
+            if purged:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), ACCOUNT_PURGE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def purge_once(self) -> int:
+        async with AsyncSessionLocal() as db:
+            user_id = await db.scalar(
+                select(User.id).filter(User.deleted_at.is_not(None)).order_by(User.deleted_at).limit(1)
+            )
+            if user_id is None:
+                return 0
+
+            result = await db.execute(
+                delete(Portfolio).filter(
+                    Portfolio.id.in_(
+                        select(Portfolio.id).filter(Portfolio.user_id == user_id).limit(ACCOUNT_PURGE_BATCH_SIZE)
+                    )
+                )
+            )
+            if result.rowcount:
+                await db.commit()
+                PURGED_ROWS.inc(result.rowcount, table="portfolios")
+                return result.rowcount
+
+            await db.execute(delete(User).filter(User.id == user_id))
+            await db.commit()
+            PURGED_ROWS.inc(table="users")
+            invalidate_cached_user(user_id)
+            return 1
+
+account_purger = AccountPurger()
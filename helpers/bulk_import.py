@@ -0,0 +1,238 @@
+# helpers/bulk_import.py
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import sys
+import tempfile
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from core.config import IMPORT_CHUNK_SIZE, IMPORT_SPOOL_MAX_BYTES
+from core.database import AsyncSessionLocal
+from core.responses import dumps_json
+from core.security import hash_passwords_async, pwd_context, shutdown_hash_executor
+from helpers.portfolio_batch import _missing_field
+from models.portfolio import Portfolio
+from models.user import User
+from schemas.portfolio_schema import AdminPortfolioCreate
+from schemas.user_schema import AdminUserCreate
+
+IMPORT_SCHEMAS = {"users": AdminUserCreate, "portfolios": AdminPortfolioCreate}
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'kayıt'}: {error['msg']}" for error in exc.errors()
+    )
+
+def read_records(text_file, import_format: str):
+    if import_format == "csv":
+        reader = csv.DictReader(text_file)
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+        return
+
+    for line_number, line in enumerate(text_file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, "Geçersiz JSON satırı."
+            continue
+        yield line_number, record if isinstance(record, dict) else "Her satır bir JSON nesnesi olmalıdır."
+
+def _validate(schema, line_number: int, record, errors: list) -> object | None:
+    if isinstance(record, str):
+        errors.append({"line": line_number, "error": record})
+        return None
+    try:
+        return schema.model_validate(record)
+    except ValidationError as exc:
+        errors.append({"line": line_number, "error": _validation_message(exc)})
+        return None
+
+async def _import_users(db, chunk: list, prehashed: bool, seen: set, errors: list) -> int:
+    candidates = []
+    for line_number, record in chunk:
+        user = _validate(AdminUserCreate, line_number, record, errors)
+        if user is None:
+            continue
+        if prehashed and not pwd_context.identify(user.password):
+            errors.append({"line": line_number, "error": "Şifre tanınan bir hash biçiminde değil."})
+            continue
+        keys = (f"u:{user.username.lower()}", f"e:{str(user.email).lower()}")
+        if seen.intersection(keys):
+            errors.append({"line": line_number, "error": "Bu e-posta veya kullanıcı adı dosyada tekrar ediyor."})
+            continue
+        seen.update(keys)
+        candidates.append((line_number, user))
+    if not candidates:
+        return 0
+
+    usernames = [user.username.lower() for _, user in candidates]
+    emails = [str(user.email).lower() for _, user in candidates]
+    taken = set()
+    for username, email in await db.execute(
+        select(func.lower(User.username), func.lower(User.email)).filter(
+            or_(func.lower(User.username).in_(usernames), func.lower(User.email).in_(emails))
+        )
+    ):
+        taken.update((f"u:{username}", f"e:{email}"))
+
+    pending = []
+    for line_number, user in candidates:
+        if taken.intersection((f"u:{user.username.lower()}", f"e:{str(user.email).lower()}")):
+            errors.append({"line": line_number, "error": "Bu e-posta veya kullanıcı adı zaten mevcut."})
+        else:
+            pending.append((line_number, user))
+    if not pending:
+        return 0
+
+    passwords = [user.password for _, user in pending]
+    if not prehashed:
+        passwords = await hash_passwords_async(passwords)
+
+    rows = [
+        {
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "username": user.username,
+            "email": str(user.email),
+            "password": password,
+            "is_admin": user.is_admin,
+            "is_verified": user.is_verified,
+        }
+        for (_, user), password in zip(pending, passwords)
+    ]
+    return await _insert_chunk(db, User, rows, [line_number for line_number, _ in pending], errors)
+
+async def _import_portfolios(db, chunk: list, errors: list) -> int:
+    candidates = []
+    for line_number, record in chunk:
+        portfolio = _validate(AdminPortfolioCreate, line_number, record, errors)
+        if portfolio is None:
+            continue
+        field = _missing_field(portfolio.model_dump())
+        if field:
+            errors.append({"line": line_number, "error": f"'{field}' alanı zorunludur."})
+            continue
+        candidates.append((line_number, portfolio))
+    if not candidates:
+        return 0
+
+    existing_users = set((await db.scalars(
+        select(User.id).filter(User.id.in_({portfolio.user_id for _, portfolio in candidates}))
+    )).all())
+
+    pending = []
+    for line_number, portfolio in candidates:
+        if portfolio.user_id in existing_users:
+            pending.append((line_number, portfolio))
+        else:
+            errors.append({"line": line_number, "error": "Kullanıcı bulunamadı."})
+    if not pending:
+        return 0
+
+    rows = [portfolio.model_dump() for _, portfolio in pending]
+    return await _insert_chunk(db, Portfolio, rows, [line_number for line_number, _ in pending], errors)
+
+async def _insert_chunk(db, model, rows: list[dict], line_numbers: list[int], errors: list) -> int:
+    try:
+        await db.execute(insert(model).execution_options(render_nulls=True), rows)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        errors.extend(
+            {"line": line_number, "error": "Parça eşzamanlı bir kayıtla çakıştı, yeniden deneyin."}
+            for line_number in line_numbers
+        )
+        return 0
+    return len(rows)
+
+async def import_records(resource: str, records, prehashed: bool = False, chunk_size: int = IMPORT_CHUNK_SIZE):
+    processed = imported = failed = 0
+    seen = set()
+
+    async with AsyncSessionLocal() as db:
+        chunk = []
+        iterator = iter(records)
+        while True:
+            chunk.clear()
+            for item in iterator:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    break
+            if not chunk:
+                break
+
+            errors = []
+            if resource == "users":
+                imported += await _import_users(db, chunk, prehashed, seen, errors)
+            else:
+                imported += await _import_portfolios(db, chunk, errors)
+            processed += len(chunk)
+            failed += len(errors)
+
+            for error in sorted(errors, key=lambda item: item["line"]):
+                yield {"type": "error", **error}
+            yield {"type": "progress", "processed": processed, "imported": imported, "failed": failed}
+
+    yield {"type": "summary", "resource": resource, "processed": processed, "imported": imported, "failed": failed}
+
+async def _spool_body(request: Request):
+    spool = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_BYTES, mode="w+b")
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+async def _ndjson_events(resource: str, import_format: str, spool):
+    with spool, io.TextIOWrapper(spool, encoding="utf-8-sig", newline="") as text_file:
+        async for event in import_records(resource, read_records(text_file, import_format)):
+            yield dumps_json(event) + b"\n"
+
+async def import_response(request: Request, resource: str, import_format: str) -> StreamingResponse:
+    spool = await _spool_body(request)
+    return StreamingResponse(
+        _ndjson_events(resource, import_format, spool),
+        media_type="application/x-ndjson"
+    )
+
+async def _run_cli(args) -> int:
+    import_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    summary = {}
+    with open(args.path, encoding="utf-8-sig", newline="") as text_file, \
+            open(args.errors, "w", encoding="utf-8") as error_file:
+        records = read_records(text_file, import_format)
+        async for event in import_records(args.resource, records, args.prehashed, args.chunk_size):
+            if event["type"] == "error":
+                error_file.write(json.dumps(event, ensure_ascii=False) + "\n")
+            elif event["type"] == "progress":
+                print(
+                    f"İşlendi: {event['processed']}  Eklendi: {event['imported']}  Hatalı: {event['failed']}",
+                    file=sys.stderr
+                )
+            else:
+                summary = event
+
+    print(f"✅ {summary['imported']}/{summary['processed']} kayıt eklendi, hatalar: {args.errors}")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NDJSON/CSV dosyasından toplu kullanıcı veya portfolio aktarımı")
+    parser.add_argument("resource", choices=IMPORT_SCHEMAS)
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("ndjson", "csv"))
+    parser.add_argument("--prehashed", action="store_true", help="password sütunu hazır hash içerir")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    parser.add_argument("--errors", default="import-errors.ndjson", help="Satır bazlı hata dosyası")
+    try:
+        exit_code = asyncio.run(_run_cli(parser.parse_args()))
+    finally:
+        shutdown_hash_executor()
+    sys.exit(exit_code)
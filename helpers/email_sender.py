@@ -1,27 +1,200 @@
 # helpers/email_sender.py
 
-import aiosmtplib
+import asyncio
+import logging
+import secrets
+from datetime import timedelta
 from email.message import EmailMessage
-from core.config import SMTP_SERVER, SMTP_PORT, SMTP_USER, SMTP_PASS, SENDER_NAME
+import aiosmtplib
+from sqlalchemy import event, select, update
+from core.config import (
+    SMTP_SERVER, SMTP_PORT, SMTP_USER, SMTP_PASS, SENDER_NAME, SENDER_EMAIL,
+    SMTP_START_TLS, SMTP_TIMEOUT,
+    EMAIL_BATCH_SIZE, EMAIL_POLL_INTERVAL, EMAIL_CLAIM_LEASE_SECONDS,
+    EMAIL_MAX_ATTEMPTS, EMAIL_RETRY_BASE_SECONDS, EMAIL_RETRY_MAX_SECONDS
+)
+from core.database import AsyncSessionLocal, get_istanbul_now
+from core.metrics import Counter
+from models.email_outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+EMAILS = Counter("emails_total", "Outbox e-mails by outcome", ("status",))
 
-async def send_email_async(to_email: str, subject: str, body: str):
+def build_message(to_email: str, subject: str, body: str) -> EmailMessage:
     message = EmailMessage()
-    message["From"] = f"{SENDER_NAME} <{SMTP_USER}>"
+    message["From"] = f"{SENDER_NAME} <{SENDER_EMAIL}>"
     message["To"] = to_email
     message["Subject"] = subject
     message.set_content(body)
+    return message
+
+def enqueue_email(db, to_email: str, subject: str, body: str):
+    db.add(EmailOutbox(to_email=str(to_email), subject=subject, body=body))
+    EMAILS.inc(status="queued")
+
+    session = getattr(db, "sync_session", db)
+    if not session.info.get("email_outbox_listener"):
+        event.listen(session, "after_commit", lambda _: email_dispatcher.notify())
+        session.info["email_outbox_listener"] = True
+
+def retry_delay(attempts: int) -> timedelta:
+    seconds = EMAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, EMAIL_RETRY_MAX_SECONDS))
+
+class EmailDispatcher:
+    def __init__(self):
+        self._smtp: aiosmtplib.SMTP | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        self._loop = None
+
+    def notify(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self):
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                processed = await self.dispatch_once()
+            except Exception:
+                logger.exception("E-posta kuyruğu işlenemedi")
+                processed = 0
+
+            if processed:
+                continue
+
+            await self._disconnect()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), EMAIL_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        await self._disconnect()
 
-    try:
-        await aiosmtplib.send(
-            message,
-            hostname=SMTP_SERVER,
-            port=SMTP_PORT,
-            start_tls=True,
-            username=SMTP_USER,
-            password=SMTP_PASS
+    async def dispatch_once(self) -> int:
+        rows = await self._claim_batch()
+        if not rows:
+            return 0
+
+        errors = await self._send_batch(rows)
+        await self._record_results(rows, errors)
+        return len(rows)
+
+    async def _claim_batch(self) -> list[EmailOutbox]:
+        now = get_istanbul_now()
+        claim_token = secrets.token_hex(16)
+        due = (
+            select(EmailOutbox.id)
+            .filter(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(EMAIL_BATCH_SIZE)
         )
-        print(f"📧 E-posta gönderildi: {to_email}")
-    except Exception as e:
-        import traceback
-        print(f"❌ E-posta gönderilemedi: {e}")
-        traceback.print_exc()
\ No newline at end of file
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(EmailOutbox)
+                .filter(
+                    EmailOutbox.id.in_(due),
+                    EmailOutbox.status == "pending",
+                    EmailOutbox.next_attempt_at <= now
+                )
+                .values(
+                    claim_token=claim_token,
+                    attempts=EmailOutbox.attempts + 1,
+                    next_attempt_at=now + timedelta(seconds=EMAIL_CLAIM_LEASE_SECONDS)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            result = await db.scalars(select(EmailOutbox).filter(EmailOutbox.claim_token == claim_token))
+            return result.all()
+
+    async def _connection(self) -> aiosmtplib.SMTP:
+        if self._smtp is not None and self._smtp.is_connected:
+            return self._smtp
+
+        smtp = aiosmtplib.SMTP(
+            hostname=SMTP_SERVER, port=SMTP_PORT, start_tls=SMTP_START_TLS, timeout=SMTP_TIMEOUT
+        )
+        await smtp.connect()
+        if SMTP_USER and SMTP_PASS:
+            await smtp.login(SMTP_USER, SMTP_PASS)
+        self._smtp = smtp
+        return smtp
+
+    async def _disconnect(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is None or not smtp.is_connected:
+            return
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    async def _send_batch(self, rows: list[EmailOutbox]) -> dict[int, str | None]:
+        errors: dict[int, str | None] = {}
+        for index, row in enumerate(rows):
+            try:
+                smtp = await self._connection()
+            except (aiosmtplib.SMTPException, OSError) as e:
+                logger.warning("SMTP bağlantısı kurulamadı: %s", e)
+                for pending in rows[index:]:
+                    errors[pending.id] = f"connect: {e}"
+                break
+
+            try:
+                await smtp.send_message(build_message(row.to_email, row.subject, row.body))
+                errors[row.id] = None
+            except (aiosmtplib.SMTPException, OSError) as e:
+                logger.warning("E-posta gönderilemedi (%s): %s", row.to_email, e)
+                errors[row.id] = str(e)
+                if not smtp.is_connected:
+                    self._smtp = None
+        return errors
+
+    async def _record_results(self, rows: list[EmailOutbox], errors: dict[int, str | None]):
+        now = get_istanbul_now()
+        updates = []
+        for row in rows:
+            error = errors.get(row.id)
+            if error is None:
+                updates.append({
+                    "id": row.id, "status": "sent", "sent_at": now,
+                    "last_error": None, "claim_token": None
+                })
+            elif row.attempts >= EMAIL_MAX_ATTEMPTS:
+                updates.append({
+                    "id": row.id, "status": "failed", "last_error": error, "claim_token": None
+                })
+            else:
+                updates.append({
+                    "id": row.id, "last_error": error, "claim_token": None,
+                    "next_attempt_at": now + retry_delay(row.attempts)
+                })
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(EmailOutbox), updates)
+            await db.commit()
+
+        for values in updates:
+            EMAILS.inc(status=values.get("status", "retry"))
+
+email_dispatcher = EmailDispatcher()
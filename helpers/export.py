@@ -0,0 +1,88 @@
+# helpers/export.py
+
+import csv
+import io
+import zlib
+from datetime import datetime
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from core.config import STREAM_BATCH_SIZE
+from core.database import next_read_sessionmaker
+from core.responses import dumps_json
+from models.portfolio import Portfolio
+from models.user import User
+
+EXPORT_MODELS = {"users": User, "portfolios": Portfolio}
+
+EXPORT_COLUMNS = {
+    "users": (
+        "id", "first_name", "last_name", "username", "email",
+        "is_admin", "is_verified", "created_at", "updated_at"
+    ),
+    "portfolios": ("id", "user_id", "title", "description", "detail", "link", "created_at", "updated_at"),
+}
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _ndjson_chunk(names: tuple, rows) -> bytes:
+    return b"".join(dumps_json(dict(zip(names, row))) + b"\n" for row in rows)
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+async def _export_chunks(resource: str, names: tuple, export_format: str, after_id: int):
+    model = EXPORT_MODELS[resource]
+    stmt = (
+        select(*(getattr(model, name) for name in names))
+        .filter(model.id > after_id)
+        .order_by(model.id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+
+    if export_format == "csv":
+        yield _csv_chunk([names])
+
+    async with next_read_sessionmaker()() as db:
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            yield _ndjson_chunk(names, rows) if export_format == "ndjson" else _csv_chunk(rows)
+
+async def _gzip(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_response(
+        resource: str,
+        export_format: str,
+        after_id: int = 0,
+        compress: bool = False
+) -> StreamingResponse:
+    names = EXPORT_COLUMNS[resource]
+    chunks = _export_chunks(resource, names, export_format, after_id)
+    filename = f"{resource}-after-{after_id}.{export_format}"
+
+    if compress:
+        return StreamingResponse(
+            _gzip(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.gz"'}
+        )
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,56 @@
+# helpers/http_cache.py
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from core.database import ISTANBUL_TZ
+
+def make_etag(*parts) -> str:
+    raw = "|".join(str(part) for part in parts).encode()
+    return f'"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = ISTANBUL_TZ.localize(value)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return _as_utc(last_modified) <= since
+
+def check_conditional(
+        request: Request,
+        response: Response,
+        etag: str,
+        last_modified: datetime | None = None
+) -> Response | None:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif if_modified_since is not None and last_modified is not None:
+        not_modified = _not_modified_since(if_modified_since, last_modified)
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,109 @@
+# helpers/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import STREAM_BATCH_SIZE
+from core.database import AsyncSessionLocal
+from core.responses import dumps_json
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _encode(value) -> str:
+    raw = json.dumps(value).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode(cursor: str):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=400, detail="Geçersiz sayfalama imleci.")
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    return _encode([created_at.isoformat(), item_id])
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, item_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+def encode_offset_cursor(offset: int) -> str:
+    return _encode({"offset": offset})
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        offset = int(_decode(cursor)["offset"])
+    except (ValueError, TypeError, KeyError):
+        raise _invalid_cursor()
+    if offset < 0:
+        raise _invalid_cursor()
+    return offset
+
+def encode_sort_cursor(sort: str, value, item_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return _encode({"sort": sort, "value": value, "id": item_id})
+
+def decode_sort_cursor(cursor: str, sort: str, column) -> tuple:
+    try:
+        data = _decode(cursor)
+        if data["sort"] != sort:
+            raise ValueError(sort)
+        value = data["value"]
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        return value, int(data["id"])
+    except (ValueError, TypeError, KeyError, NotImplementedError):
+        raise _invalid_cursor()
+
+def apply_sorted_keyset(stmt, column, id_column, descending: bool, after: tuple | None):
+    if after is not None:
+        value, item_id = after
+        if descending:
+            stmt = stmt.filter(or_(column < value, and_(column == value, id_column < item_id)))
+        else:
+            stmt = stmt.filter(or_(column > value, and_(column == value, id_column > item_id)))
+    if descending:
+        return stmt.order_by(column.desc(), id_column.desc())
+    return stmt.order_by(column, id_column)
+
+def apply_keyset(stmt, model, cursor: str | None):
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        stmt = stmt.filter(
+            or_(
+                model.created_at > created_at,
+                and_(model.created_at == created_at, model.id > item_id)
+            )
+        )
+    return stmt.order_by(model.created_at, model.id)
+
+async def paginate(db: AsyncSession, stmt, model, cursor: str | None, limit: int, response: Response) -> list:
+    result = await db.scalars(apply_keyset(stmt, model, cursor).limit(limit + 1))
+    rows = result.all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return rows
+
+def stream_ndjson(stmt, model, schema, cursor: str | None, project=None, bind=None) -> StreamingResponse:
+    stmt = apply_keyset(stmt, model, cursor).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+    async def rows():
+        async with (AsyncSession(bind) if bind is not None else AsyncSessionLocal()) as db:
+            result = await db.stream_scalars(stmt)
+            async for item in result:
+                if project is None:
+                    yield schema.model_validate(item).model_dump_json() + "\n"
+                else:
+                    yield dumps_json(project(item)) + b"\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
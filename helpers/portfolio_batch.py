@@ -0,0 +1,138 @@
+# helpers/portfolio_batch.py
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.portfolio import Portfolio
+from models.user import User
+from schemas.portfolio_schema import (
+    PortfolioBatchItemResult, PortfolioBatchUpdateItem, PortfolioResponse
+)
+
+_REQUIRED_FIELDS = [
+    column.name for column in Portfolio.__table__.columns
+    if not column.nullable and column.default is None and not column.primary_key and not column.foreign_keys
+]
+
+def _missing_field(values: dict) -> str | None:
+    for field in _REQUIRED_FIELDS:
+        if field in values and values[field] is None:
+            return field
+    return None
+
+def _error(index: int, item_id: int | None, detail: str) -> PortfolioBatchItemResult:
+    return PortfolioBatchItemResult(index=index, id=item_id, status="error", detail=detail)
+
+def _not_found(index: int, item_id: int) -> PortfolioBatchItemResult:
+    return PortfolioBatchItemResult(index=index, id=item_id, status="not_found", detail="Portfolio bulunamadı.")
+
+async def batch_create_portfolios(db: AsyncSession, rows: list[dict]) -> list[PortfolioBatchItemResult]:
+    if not rows:
+        return []
+    results: list[PortfolioBatchItemResult | None] = [None] * len(rows)
+
+    user_ids = {row["user_id"] for row in rows}
+    existing_users = set((await db.scalars(select(User.id).filter(User.id.in_(user_ids)))).all())
+
+    pending = []
+    for index, row in enumerate(rows):
+        field = _missing_field({name: row.get(name) for name in _REQUIRED_FIELDS})
+        if row["user_id"] not in existing_users:
+            results[index] = _error(index, None, "Kullanıcı bulunamadı.")
+        elif field:
+            results[index] = _error(index, None, f"'{field}' alanı zorunludur.")
+        else:
+            pending.append((index, row))
+
+    if pending:
+        columns = sorted({column for _, row in pending for column in row})
+        created = await db.scalars(
+            insert(Portfolio).returning(Portfolio).execution_options(render_nulls=True),
+            [{column: row.get(column) for column in columns} for _, row in pending]
+        )
+        by_values: dict[tuple, list[Portfolio]] = {}
+        for portfolio in created.all():
+            by_values.setdefault(tuple(getattr(portfolio, column) for column in columns), []).append(portfolio)
+
+        for index, row in pending:
+            portfolio = by_values[tuple(row.get(column) for column in columns)].pop(0)
+            results[index] = PortfolioBatchItemResult(
+                index=index, id=portfolio.id, status="created",
+                portfolio=PortfolioResponse.model_validate(portfolio)
+            )
+        await db.commit()
+    return results
+
+async def batch_update_portfolios(
+        db: AsyncSession,
+        items: list[PortfolioBatchUpdateItem],
+        owner_id: int | None = None
+) -> list[PortfolioBatchItemResult]:
+    if not items:
+        return []
+    results: list[PortfolioBatchItemResult | None] = [None] * len(items)
+
+    stmt = select(Portfolio).filter(Portfolio.id.in_({item.id for item in items})).with_for_update()
+    if owner_id is not None:
+        stmt = stmt.filter(Portfolio.user_id == owner_id)
+    existing = {portfolio.id: portfolio for portfolio in await db.scalars(stmt)}
+
+    changes = {}
+    pending = []
+    for index, item in enumerate(items):
+        values = item.model_dump(exclude_unset=True, exclude={"id"})
+        field = _missing_field(values)
+        if item.id not in existing:
+            results[index] = _not_found(index, item.id)
+        elif field:
+            results[index] = _error(index, item.id, f"'{field}' alanı zorunludur.")
+        else:
+            if values:
+                changes.setdefault(item.id, {}).update(values)
+            pending.append(index)
+
+    if pending:
+        if changes:
+            columns = sorted({column for values in changes.values() for column in values})
+            await db.execute(update(Portfolio), [
+                {"id": portfolio_id, **{
+                    column: values.get(column, getattr(existing[portfolio_id], column)) for column in columns
+                }}
+                for portfolio_id, values in changes.items()
+            ])
+        updated = await db.scalars(
+            select(Portfolio)
+            .filter(Portfolio.id.in_({items[index].id for index in pending}))
+            .execution_options(populate_existing=True)
+        )
+        portfolios = {portfolio.id: portfolio for portfolio in updated}
+        for index in pending:
+            portfolio = portfolios[items[index].id]
+            results[index] = PortfolioBatchItemResult(
+                index=index, id=portfolio.id, status="updated",
+                portfolio=PortfolioResponse.model_validate(portfolio)
+            )
+        await db.commit()
+    return results
+
+async def batch_delete_portfolios(
+        db: AsyncSession,
+        ids: list[int],
+        owner_id: int | None = None
+) -> list[PortfolioBatchItemResult]:
+    if not ids:
+        return []
+
+    stmt = delete(Portfolio).filter(Portfolio.id.in_(set(ids)))
+    if owner_id is not None:
+        stmt = stmt.filter(Portfolio.user_id == owner_id)
+    deleted = set((await db.scalars(stmt.returning(Portfolio.id))).all())
+    await db.commit()
+
+    results = []
+    for index, item_id in enumerate(ids):
+        if item_id in deleted:
+            results.append(PortfolioBatchItemResult(index=index, id=item_id, status="deleted"))
+            deleted.discard(item_id)
+        else:
+            results.append(_not_found(index, item_id))
+    return results
@@ -0,0 +1,57 @@
+# helpers/projection.py
+
+from fastapi import HTTPException
+from sqlalchemy.orm import joinedload, load_only
+from models.portfolio import Portfolio
+from models.user import User
+
+PORTFOLIO_FIELDS = ("id", "title", "description", "detail", "link", "created_at", "updated_at", "user_id")
+USER_FIELDS = ("id", "username", "email")
+
+LIST_FIELDS = ("id", "title", "description", "link", "created_at", "updated_at")
+LIST_USER_FIELDS = ("id", "username")
+
+FIELDS_DESCRIPTION = (
+    "Virgülle ayrılmış alan listesi (ör. title,description,detail,user.email). "
+    "Boş bırakılırsa detail hariç özet alanlar döner."
+)
+
+def _add(target: list[str], name: str):
+    if name not in target:
+        target.append(name)
+
+def parse_portfolio_fields(fields: str | None, include_user: bool) -> tuple[list[str], list[str]]:
+    if not fields:
+        portfolio_fields = list(LIST_FIELDS) if include_user else [*LIST_FIELDS, "user_id"]
+        return portfolio_fields, list(LIST_USER_FIELDS) if include_user else []
+
+    portfolio_fields, user_fields = ["id"], []
+    for name in (part.strip() for part in fields.split(",")):
+        if not name:
+            continue
+        if include_user and name == "user":
+            for user_field in LIST_USER_FIELDS:
+                _add(user_fields, user_field)
+        elif include_user and name.startswith("user.") and name[5:] in USER_FIELDS:
+            _add(user_fields, name[5:])
+        elif name in PORTFOLIO_FIELDS:
+            _add(portfolio_fields, name)
+        else:
+            raise HTTPException(status_code=400, detail=f"Geçersiz alan: {name}")
+
+    if user_fields and "id" not in user_fields:
+        user_fields.insert(0, "id")
+    return portfolio_fields, user_fields
+
+def portfolio_load_options(portfolio_fields: list[str], user_fields: list[str]) -> list:
+    columns = {*portfolio_fields, "id", "created_at"}
+    options = [load_only(*(getattr(Portfolio, name) for name in columns))]
+    if user_fields:
+        options.append(joinedload(Portfolio.user).load_only(*(getattr(User, name) for name in user_fields)))
+    return options
+
+def project_portfolio(portfolio: Portfolio, portfolio_fields: list[str], user_fields: list[str]) -> dict:
+    data = {name: getattr(portfolio, name) for name in portfolio_fields}
+    if user_fields:
+        data["user"] = {name: getattr(portfolio.user, name) for name in user_fields}
+    return data
@@ -0,0 +1,90 @@
+# helpers/search.py
+
+import html
+import re
+from sqlalchemy import and_, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import SEARCH_TS_CONFIG
+from models.portfolio import Portfolio
+from models.user import User
+
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+_SQLITE_SEARCH = text(
+    "SELECT portfolios_fts.rowid AS id, bm25(portfolios_fts, 10.0, 4.0, 1.0) AS rank, "
+    "snippet(portfolios_fts, -1, char(2), char(3), '…', 16) AS snippet "
+    "FROM portfolios_fts JOIN portfolios p ON p.id = portfolios_fts.rowid JOIN users u ON u.id = p.user_id "
+    "WHERE portfolios_fts MATCH :query AND u.deleted_at IS NULL "
+    "ORDER BY rank LIMIT :limit OFFSET :offset"
+)
+
+_POSTGRES_SEARCH = text(
+    "SELECT hit.id, hit.rank, ts_headline(CAST(:config AS regconfig), "
+    "coalesce(hit.detail, hit.description, hit.title), hit.query, "
+    "'StartSel=' || chr(2) || ', StopSel=' || chr(3) || ', MaxWords=35, MinWords=15') AS snippet "
+    "FROM (SELECT p.id, p.title, p.description, p.detail, q.query, "
+    "ts_rank_cd(p.search_vector, q.query) AS rank "
+    "FROM portfolios p JOIN users u ON u.id = p.user_id, "
+    "websearch_to_tsquery(CAST(:config AS regconfig), :query) AS q(query) "
+    "WHERE p.search_vector @@ q.query AND u.deleted_at IS NULL "
+    "ORDER BY rank DESC, p.id LIMIT :limit OFFSET :offset) AS hit "
+    "ORDER BY hit.rank DESC, hit.id"
+)
+
+def to_fts5_query(query: str) -> str:
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _like_search(query: str, limit: int, offset: int):
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return None
+    matches = [
+        or_(*(column.ilike(_like_pattern(term), escape="\\") for column in (
+            Portfolio.title, Portfolio.description, Portfolio.detail
+        )))
+        for term in terms
+    ]
+    return (
+        select(Portfolio.id)
+        .filter(and_(*matches), Portfolio.user.has(User.deleted_at.is_(None)))
+        .order_by(Portfolio.created_at.desc(), Portfolio.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+def _render_snippet(snippet: str | None) -> str | None:
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+async def search_portfolio_hits(db: AsyncSession, query: str, limit: int, offset: int) -> list[tuple]:
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        fts_query = to_fts5_query(query)
+        if not fts_query:
+            return []
+        result = await db.execute(_SQLITE_SEARCH, {"query": fts_query, "limit": limit, "offset": offset})
+        return [(row.id, -row.rank, _render_snippet(row.snippet)) for row in result]
+
+    if dialect == "postgresql":
+        result = await db.execute(
+            _POSTGRES_SEARCH,
+            {"config": SEARCH_TS_CONFIG, "query": query, "limit": limit, "offset": offset}
+        )
+        return [(row.id, float(row.rank), _render_snippet(row.snippet)) for row in result]
+
+    stmt = _like_search(query, limit, offset)
+    if stmt is None:
+        return []
+    return [(portfolio_id, 0.0, None) for portfolio_id in await db.scalars(stmt)]
@@ -0,0 +1,75 @@
+# helpers/user_cache_sync.py
+
+import asyncio
+import logging
+from datetime import timedelta
+from sqlalchemy import delete, select
+from core.config import USER_CACHE_SYNC_INTERVAL, USER_CACHE_SYNC_RETENTION_SECONDS
+from core.database import AsyncSessionLocal, get_istanbul_now
+from core.dependencies import invalidate_cached_user
+from core.metrics import Counter
+from models.user_cache_invalidation import UserCacheInvalidation
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_SYNC_EVICTIONS = Counter(
+    "user_cache_sync_evictions_total", "Cached users evicted after a change made by any worker"
+)
+
+_OVERLAP = timedelta(seconds=5)
+
+class UserCacheSync:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+        self._since = None
+        self._last_cleanup = None
+
+    def start(self):
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._since = self._last_cleanup = get_istanbul_now()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await self.sync_once()
+            except Exception:
+                logger.exception("Kullanıcı önbelleği eşitlenemedi")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), USER_CACHE_SYNC_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def sync_once(self) -> int:
+        now = get_istanbul_now()
+        async with AsyncSessionLocal() as db:
+            user_ids = set((await db.scalars(
+                select(UserCacheInvalidation.user_id)
+                .filter(UserCacheInvalidation.created_at >= self._since - _OVERLAP)
+            )).all())
+
+            if now - self._last_cleanup >= timedelta(seconds=USER_CACHE_SYNC_RETENTION_SECONDS):
+                await db.execute(delete(UserCacheInvalidation).filter(
+                    UserCacheInvalidation.created_at < now - timedelta(seconds=USER_CACHE_SYNC_RETENTION_SECONDS)
+                ))
+                await db.commit()
+                self._last_cleanup = now
+
+        self._since = now
+        for user_id in user_ids:
+            invalidate_cached_user(user_id)
+        if user_ids:
+            USER_CACHE_SYNC_EVICTIONS.inc(len(user_ids))
+        return len(user_ids)
+
+user_cache_sync = UserCacheSync()
@@ -1,10 +1,40 @@
 # main.py
 
+import hmac
 import uvicorn
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from routers import auth, users, admin, portfolios
-from core.config import FRONTEND_URL
+from core.config import (
+    FRONTEND_URL, EMAIL_DISPATCHER_ENABLED, FAST_JSON_RESPONSES, ACCOUNT_SOFT_DELETE, PASSWORD_HASH_CALIBRATE,
+    METRICS_TOKEN
+)
+from core.database import dispose_engines
+from core.metrics import CONTENT_TYPE_LATEST, render_latest
+from core.read_routing import LAST_WRITE_HEADER, ReadYourWritesMiddleware
+from core.responses import FastJSONResponse
+from core.security import calibrate_password_hashing, shutdown_hash_executor
+from core.timing import TimedRoute, TimingMiddleware
+from helpers.account_purge import account_purger
+from helpers.email_sender import email_dispatcher
+from helpers.user_cache_sync import user_cache_sync
+from helpers.pagination import NEXT_CURSOR_HEADER
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if EMAIL_DISPATCHER_ENABLED:
+        email_dispatcher.start()
+    if ACCOUNT_SOFT_DELETE:
+        account_purger.start()
+    user_cache_sync.start()
+    yield
+    await user_cache_sync.stop()
+    await account_purger.stop()
+    await email_dispatcher.stop()
+    shutdown_hash_executor()
+    await dispose_engines()
 
 app = FastAPI(
     title="Portfolio Backend",
@@ -13,6 +43,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     swagger_ui_parameters={"defaultModelsExpandDepth": -1},
+    lifespan=lifespan,
+    **({"default_response_class": FastJSONResponse} if FAST_JSON_RESPONSES else {}),
     openapi_tags=[
         {"name": "Auth", "description": "Kayıt, giriş, doğrulama işlemleri"},
         {"name": "Admin", "description": "Yönetici işlemleri"},
@@ -21,20 +53,39 @@ app = FastAPI(
     ]
 )
 
+app.router.route_class = TimedRoute
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[FRONTEND_URL],
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, LAST_WRITE_HEADER, "Server-Timing"]
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(TimingMiddleware)
 
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(admin.router)
 app.include_router(portfolios.router)
 
+if METRICS_TOKEN:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics(authorization: str = Header("")):
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Metrikler için geçerli bir token gereklidir.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return PlainTextResponse(render_latest(), media_type=CONTENT_TYPE_LATEST)
+
 if __name__ == "__main__":
+    if PASSWORD_HASH_CALIBRATE:
+        calibrate_password_hashing()
     uvicorn.run(
         "main:app",
         host="127.0.0.1",
@@ -0,0 +1,40 @@
+# migrations/__init__.py
+
+import importlib
+import pkgutil
+from sqlalchemy import text
+from core.database import Base, engine, get_istanbul_now
+import models.user  # noqa
+import models.portfolio  # noqa
+import models.email_outbox  # noqa
+import models.user_cache_invalidation  # noqa
+
+def _versions() -> list[str]:
+    return sorted(
+        module.name for module in pkgutil.iter_modules(__path__)
+        if module.name.startswith("v")
+    )
+
+def run_migrations(bind=engine) -> list[str]:
+    Base.metadata.create_all(bind)
+
+    with bind.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version VARCHAR(128) PRIMARY KEY, applied_at TIMESTAMP NOT NULL)"
+        ))
+        applied = set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+    newly_applied = []
+    for version in _versions():
+        if version in applied:
+            continue
+        module = importlib.import_module(f"{__name__}.{version}")
+        with bind.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, applied_at) VALUES (:version, :applied_at)"),
+                {"version": version, "applied_at": get_istanbul_now()}
+            )
+        newly_applied.append(version)
+    return newly_applied
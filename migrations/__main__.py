@@ -0,0 +1,11 @@
+# migrations/__main__.py
+
+from migrations import run_migrations
+
+if __name__ == "__main__":
+    applied = run_migrations()
+    if applied:
+        for version in applied:
+            print(f"✅ Uygulandı: {version}")
+    else:
+        print("Veritabanı güncel.")
@@ -0,0 +1,34 @@
+# migrations/v0001_lookup_indexes.py
+
+from sqlalchemy import text
+
+def _case_collisions(conn, column: str) -> dict[str, list[int]]:
+    rows = conn.execute(text(
+        f"SELECT id, lower({column}) FROM users WHERE lower({column}) IN ("
+        f"SELECT lower({column}) FROM users GROUP BY lower({column}) HAVING count(*) > 1"
+        f") ORDER BY id"
+    ))
+    collisions: dict[str, list[int]] = {}
+    for user_id, value in rows:
+        collisions.setdefault(value, []).append(user_id)
+    return collisions
+
+def upgrade(conn):
+    conflicts = [
+        f"{column} '{value}': {', '.join(map(str, user_ids))}"
+        for column in ("username", "email")
+        for value, user_ids in _case_collisions(conn, column).items()
+    ]
+    if conflicts:
+        raise RuntimeError(
+            "Büyük/küçük harf farkı dışında aynı olan kullanıcı adları veya e-postalar var. "
+            "Benzersiz indeksler oluşturulmadan önce bu kullanıcıları düzeltin (kullanıcı id'leri):\n"
+            + "\n".join(conflicts)
+        )
+
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username_lower ON users (lower(username))"))
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email))"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_portfolios_created_at_id ON portfolios (created_at, id)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_portfolios_user_id_created_at_id ON portfolios (user_id, created_at, id)"
+    ))
@@ -0,0 +1,41 @@
+# migrations/v0002_portfolio_search.py
+
+from sqlalchemy import text
+from core.config import SEARCH_TS_CONFIG
+
+SQLITE_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS portfolios_fts USING fts5("
+    "title, description, detail, content='portfolios', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS portfolios_fts_ai AFTER INSERT ON portfolios BEGIN "
+    "INSERT INTO portfolios_fts(rowid, title, description, detail) "
+    "VALUES (new.id, new.title, new.description, new.detail); END",
+    "CREATE TRIGGER IF NOT EXISTS portfolios_fts_ad AFTER DELETE ON portfolios BEGIN "
+    "INSERT INTO portfolios_fts(portfolios_fts, rowid, title, description, detail) "
+    "VALUES ('delete', old.id, old.title, old.description, old.detail); END",
+    "CREATE TRIGGER IF NOT EXISTS portfolios_fts_au AFTER UPDATE OF title, description, detail ON portfolios BEGIN "
+    "INSERT INTO portfolios_fts(portfolios_fts, rowid, title, description, detail) "
+    "VALUES ('delete', old.id, old.title, old.description, old.detail); "
+    "INSERT INTO portfolios_fts(rowid, title, description, detail) "
+    "VALUES (new.id, new.title, new.description, new.detail); END",
+    "INSERT INTO portfolios_fts(portfolios_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_STATEMENTS = [
+    "ALTER TABLE portfolios ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(description, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(detail, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_portfolios_search_vector ON portfolios USING GIN (search_vector)",
+]
+
+def upgrade(conn):
+    if conn.dialect.name == "sqlite":
+        statements = SQLITE_STATEMENTS
+    elif conn.dialect.name == "postgresql":
+        statements = POSTGRES_STATEMENTS
+    else:
+        return
+
+    for statement in statements:
+        conn.execute(text(statement))
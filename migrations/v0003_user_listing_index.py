@@ -0,0 +1,6 @@
+# migrations/v0003_user_listing_index.py
+
+from sqlalchemy import text
+
+def upgrade(conn):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id)"))
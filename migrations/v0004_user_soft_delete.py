@@ -0,0 +1,9 @@
+# migrations/v0004_user_soft_delete.py
+
+from sqlalchemy import inspect, text
+
+def upgrade(conn):
+    columns = {column["name"] for column in inspect(conn).get_columns("users")}
+    if "deleted_at" not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN deleted_at TIMESTAMP WITH TIME ZONE"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_deleted_at ON users (deleted_at)"))
@@ -0,0 +1,24 @@
+# models/email_outbox.py
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from core.database import Base, get_istanbul_now
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(120), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String(16), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    claim_token = Column(String(32), nullable=True)
+    next_attempt_at = Column(DateTime(timezone=True), default=get_istanbul_now, nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), default=get_istanbul_now, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=get_istanbul_now, onupdate=get_istanbul_now)
@@ -1,11 +1,15 @@
 # models/portfolio.py
 
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from core.database import Base, get_istanbul_now
 
 class Portfolio(Base):
     __tablename__ = "portfolios"
+    __table_args__ = (
+        Index("ix_portfolios_created_at_id", "created_at", "id"),
+        Index("ix_portfolios_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -1,6 +1,6 @@
 # models/user.py
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from core.database import Base, get_istanbul_now
 
@@ -19,5 +19,11 @@ class User(Base):
 
     created_at = Column(DateTime(timezone=True), default=get_istanbul_now, nullable=False)
     updated_at = Column(DateTime(timezone=True), default=get_istanbul_now, onupdate=get_istanbul_now)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
 
-    portfolios = relationship("Portfolio", back_populates="user", cascade="all, delete")
\ No newline at end of file
+    portfolios = relationship("Portfolio", back_populates="user", cascade="all, delete", passive_deletes=True)
+
+Index("ix_users_username_lower", func.lower(User.username), unique=True)
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
+Index("ix_users_created_at_id", User.created_at, User.id)
+Index("ix_users_deleted_at", User.deleted_at)
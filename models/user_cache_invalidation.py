@@ -0,0 +1,11 @@
+# models/user_cache_invalidation.py
+
+from sqlalchemy import Column, Integer, DateTime
+from core.database import Base, get_istanbul_now
+
+class UserCacheInvalidation(Base):
+    __tablename__ = "user_cache_invalidations"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=get_istanbul_now, nullable=False, index=True)
@@ -1,19 +1,40 @@
 # routers/admin.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from datetime import datetime
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request, Response, status
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PORTFOLIO_BATCH_MAX_ITEMS
 from core.database import get_db
-from core.dependencies import get_current_user
+from core.dependencies import get_current_user, get_read_db, invalidate_cached_user
+from core.responses import fast_json_response
 from models.user import User
 from models.portfolio import Portfolio
-from schemas.user_schema import AdminUserCreate, UserResponse, AdminUserUpdate
-from schemas.portfolio_schema import PortfolioResponse, PortfolioUpdate
-from core.security import hash_password
+from schemas.user_schema import AdminUserCreate, AdminUserListItem, UserResponse, AdminUserUpdate
+from schemas.portfolio_schema import (
+    PortfolioResponse,
+    PortfolioUpdate,
+    AdminPortfolioCreate,
+    PortfolioBatchUpdateItem,
+    PortfolioBatchDelete,
+    PortfolioBatchItemResult,
+    PortfolioListItem
+)
+from core.security import hash_password_async
+from core.query_budget import query_budget
+from core.timing import TimedRoute
+from helpers.pagination import NEXT_CURSOR_HEADER, apply_sorted_keyset, decode_sort_cursor, encode_sort_cursor
+from helpers.account_purge import account_purger, remove_account
+from helpers.export import export_response
+from helpers.bulk_import import import_response
+from helpers.projection import FIELDS_DESCRIPTION, parse_portfolio_fields, portfolio_load_options, project_portfolio
+from helpers.portfolio_batch import batch_create_portfolios, batch_update_portfolios, batch_delete_portfolios
 
-router = APIRouter(prefix="/admin", tags=["Admin"])
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=TimedRoute)
 
-def admin_required(current_user: User = Depends(get_current_user)):
+USER_SORT_PATTERN = "^-?(created_at|username|email|id)$"
+
+async def admin_required(current_user: User = Depends(get_current_user)):
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -21,19 +42,98 @@ def admin_required(current_user: User = Depends(get_current_user)):
         )
     return current_user
 
-@router.get("/users", response_model=list[UserResponse])
-def get_all_users_as_admin(db: Session = Depends(get_db), _: User = Depends(admin_required)):
-    return db.query(User).all()
+@router.get("/users", response_model=list[AdminUserListItem])
+@query_budget(3)
+async def get_all_users_as_admin(
+        response: Response,
+        cursor: str | None = Query(None, description="Önceki sayfanın X-Next-Cursor değeri"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        sort: str = Query("created_at", pattern=USER_SORT_PATTERN, description="Sıralama alanı, azalan için '-' önekli"),
+        is_verified: bool | None = Query(None),
+        is_admin: bool | None = Query(None),
+        created_from: datetime | None = Query(None, description="Bu tarihte veya sonrasında oluşturulanlar"),
+        created_to: datetime | None = Query(None, description="Bu tarihten önce oluşturulanlar"),
+        username_prefix: str | None = Query(None, min_length=1, max_length=50),
+        db: AsyncSession = Depends(get_read_db),
+        _: User = Depends(admin_required)
+):
+    descending = sort.startswith("-")
+    sort_key = sort.lstrip("-")
+    column = getattr(User, sort_key)
+
+    stmt = select(User).filter(User.deleted_at.is_(None))
+    if is_verified is not None:
+        stmt = stmt.filter(User.is_verified == is_verified)
+    if is_admin is not None:
+        stmt = stmt.filter(User.is_admin == is_admin)
+    if created_from is not None:
+        stmt = stmt.filter(User.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.filter(User.created_at < created_to)
+    if username_prefix:
+        stmt = stmt.filter(func.lower(User.username).startswith(username_prefix.lower(), autoescape=True))
+
+    after = decode_sort_cursor(cursor, sort, column) if cursor else None
+    users = (await db.scalars(
+        apply_sorted_keyset(stmt, column, User.id, descending, after).limit(limit + 1)
+    )).all()
+    if len(users) > limit:
+        users = users[:limit]
+        last = users[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_sort_cursor(sort, getattr(last, sort_key), last.id)
+    if not users:
+        return []
+
+    stats = {
+        user_id: (count, last_created)
+        for user_id, count, last_created in await db.execute(
+            select(Portfolio.user_id, func.count(Portfolio.id), func.max(Portfolio.created_at))
+            .filter(Portfolio.user_id.in_([user.id for user in users]))
+            .group_by(Portfolio.user_id)
+        )
+    }
+
+    return [
+        AdminUserListItem.model_validate(user).model_copy(update={
+            "portfolio_count": stats.get(user.id, (0, None))[0],
+            "last_portfolio_at": stats.get(user.id, (0, None))[1]
+        })
+        for user in users
+    ]
+
+@router.get("/export/{resource}")
+async def export_as_admin(
+        resource: str = Path(..., pattern="^(users|portfolios)$"),
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Çıktı biçimi"),
+        after_id: int = Query(0, ge=0, description="Yarıda kalan aktarımı bu id'den sonra sürdür"),
+        gzip: bool = Query(False, description="Çıktıyı gzip ile sıkıştırarak akıt"),
+        _: User = Depends(admin_required)
+):
+    return export_response(resource, format, after_id, gzip)
+
+@router.post("/import/{resource}")
+async def import_as_admin(
+        request: Request,
+        resource: str = Path(..., pattern="^(users|portfolios)$"),
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Gövde biçimi"),
+        _: User = Depends(admin_required)
+):
+    return await import_response(request, resource, format)
 
 @router.post("/users", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user_as_admin(
+async def create_user_as_admin(
         user_data: AdminUserCreate,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         _: User = Depends(admin_required)
 ):
-    existing_user = db.query(User).filter(
-        or_(User.username == user_data.username, User.email == str(user_data.email))
-    ).first()
+    existing_user = await db.scalar(
+        select(User).filter(
+            or_(
+                func.lower(User.username) == func.lower(user_data.username),
+                func.lower(User.email) == func.lower(str(user_data.email))
+            )
+        ).limit(1)
+    )
     if existing_user:
         raise HTTPException(status_code=400, detail="Bu e-posta veya kullanıcı adı zaten mevcut.")
 
@@ -42,23 +142,23 @@ def create_user_as_admin(
         last_name=user_data.last_name,
         username=user_data.username,
         email=str(user_data.email),
-        password=hash_password(user_data.password),
+        password=await hash_password_async(user_data.password),
         is_admin=bool(user_data.is_admin),
         is_verified=bool(user_data.is_verified)
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 @router.put("/users/{user_id}", response_model=UserResponse)
-def update_user_as_admin(
+async def update_user_as_admin(
         user_id: int,
         user_update: AdminUserUpdate,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         _: User = Depends(admin_required)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).filter(User.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı.")
 
@@ -67,45 +167,92 @@ def update_user_as_admin(
     if 'email' in update_data:
         update_data['email'] = str(update_data['email'])
 
+    identifiers = [
+        func.lower(getattr(User, field)) == func.lower(update_data[field])
+        for field in ("username", "email") if update_data.get(field)
+    ]
+    if identifiers:
+        existing_user = await db.scalar(
+            select(User.id).filter(or_(*identifiers), User.id != user_id).limit(1)
+        )
+        if existing_user:
+            raise HTTPException(status_code=400, detail="Bu e-posta veya kullanıcı adı zaten mevcut.")
+
     for field, value in update_data.items():
         setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_cached_user(user.id)
     return user
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user_as_admin(
+async def delete_user_as_admin(
         user_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         _: User = Depends(admin_required)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).filter(User.id == user_id, User.deleted_at.is_(None)))
     if not user:
         raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı.")
 
-    db.query(Portfolio).filter(Portfolio.user_id == user.id).delete()
-    db.delete(user)
-    db.commit()
+    await remove_account(db, user)
+    await db.commit()
+    invalidate_cached_user(user_id)
+    account_purger.notify()
     return None
 
-@router.get("/portfolios/{user_id}", response_model=list[PortfolioResponse])
-def get_user_portfolios_as_admin(
+@router.post("/portfolios/batch", response_model=list[PortfolioBatchItemResult])
+@query_budget(3)
+async def create_portfolios_batch_as_admin(
+        items: list[AdminPortfolioCreate] = Body(..., min_length=1, max_length=PORTFOLIO_BATCH_MAX_ITEMS),
+        db: AsyncSession = Depends(get_db),
+        _: User = Depends(admin_required)
+):
+    return await batch_create_portfolios(db, [item.model_dump() for item in items])
+
+@router.put("/portfolios/batch", response_model=list[PortfolioBatchItemResult])
+@query_budget(4)
+async def update_portfolios_batch_as_admin(
+        items: list[PortfolioBatchUpdateItem] = Body(..., min_length=1, max_length=PORTFOLIO_BATCH_MAX_ITEMS),
+        db: AsyncSession = Depends(get_db),
+        _: User = Depends(admin_required)
+):
+    return await batch_update_portfolios(db, items)
+
+@router.delete("/portfolios/batch", response_model=list[PortfolioBatchItemResult])
+@query_budget(2)
+async def delete_portfolios_batch_as_admin(
+        batch: PortfolioBatchDelete,
+        db: AsyncSession = Depends(get_db),
+        _: User = Depends(admin_required)
+):
+    return await batch_delete_portfolios(db, batch.ids)
+
+@router.get("/portfolios/{user_id}", response_model=list[PortfolioListItem], response_model_exclude_unset=True)
+@query_budget(2)
+async def get_user_portfolios_as_admin(
         user_id: int,
-        db: Session = Depends(get_db),
+        fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+        db: AsyncSession = Depends(get_read_db),
         _: User = Depends(admin_required)
 ):
-    portfolios = db.query(Portfolio).filter(Portfolio.user_id == user_id).all()
-    return portfolios
+    projection = parse_portfolio_fields(fields, include_user=False)
+    result = await db.scalars(
+        select(Portfolio)
+        .options(*portfolio_load_options(*projection))
+        .filter(Portfolio.user_id == user_id)
+    )
+    return fast_json_response([project_portfolio(portfolio, *projection) for portfolio in result])
 
 @router.put("/portfolios/{portfolio_id}", response_model=PortfolioResponse)
-def update_portfolio_as_admin(
+async def update_portfolio_as_admin(
         portfolio_id: int,
         portfolio_data: PortfolioUpdate,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         _: User = Depends(admin_required)
 ):
-    portfolio = db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
+    portfolio = await db.scalar(select(Portfolio).filter(Portfolio.id == portfolio_id))
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio bulunamadı.")
 
@@ -113,20 +260,20 @@ def update_portfolio_as_admin(
     for key, value in update_data.items():
         setattr(portfolio, key, value)
 
-    db.commit()
-    db.refresh(portfolio)
+    await db.commit()
+    await db.refresh(portfolio)
     return portfolio
 
 @router.delete("/portfolios/{portfolio_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_portfolio_as_admin(
+async def delete_portfolio_as_admin(
         portfolio_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         _: User = Depends(admin_required)
 ):
-    portfolio = db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
+    portfolio = await db.scalar(select(Portfolio).filter(Portfolio.id == portfolio_id))
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio bulunamadı.")
 
-    db.delete(portfolio)
-    db.commit()
+    await db.delete(portfolio)
+    await db.commit()
     return None
\ No newline at end of file
@@ -1,40 +1,47 @@
 # routers/auth.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import JSONResponse
+import asyncio
 import secrets
 from datetime import timedelta
 
 from core.database import get_db
 from core.security import (
-    hash_password, verify_password, create_token, decode_token
+    AUTH_FAILURES, PASSWORD_REHASHES, hash_password_async, verify_password_async, create_token, decode_token,
+    password_needs_rehash
 )
 from schemas.user_schema import UserCreate, UserLogin, UserResponse
 from models.user import User
-from helpers.email_sender import send_email_async
+from helpers.email_sender import enqueue_email
 from core.config import FRONTEND_URL
-from core.dependencies import get_current_user
-
-router = APIRouter(prefix="/auth", tags=["Auth"])
-
-def get_user_by_username_or_email(db: Session, identifier: str) -> User | None:
-    return db.query(User).filter(
-        or_(
-            User.username.ilike(identifier),
-            User.email.ilike(identifier)
-        )  # noqa
-    ).first()
+from core.dependencies import get_current_user, invalidate_cached_user
+from core.rate_limit import enforce_rate_limit
+from core.timing import TimedRoute
+
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=TimedRoute)
+
+async def get_user_by_username_or_email(db: AsyncSession, *identifiers: str) -> User | None:
+    lowered = [func.lower(identifier) for identifier in identifiers]
+    return await db.scalar(
+        select(User).filter(
+            or_(
+                func.lower(User.username).in_(lowered),
+                func.lower(User.email).in_(lowered)
+            )  # noqa
+        ).limit(1)
+    )
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
         user_data: UserCreate,
-        background_tasks: BackgroundTasks,
-        db: Session = Depends(get_db)
+        request: Request,
+        db: AsyncSession = Depends(get_db)
 ):
-    existing_user = get_user_by_username_or_email(db, user_data.username) or \
-                    get_user_by_username_or_email(db, str(user_data.email))
+    await enforce_rate_limit(request, "register", str(user_data.email))
+    existing_user = await get_user_by_username_or_email(db, user_data.username, str(user_data.email))
 
     if existing_user:
         raise HTTPException(status_code=400, detail="Email veya kullanıcı adı zaten kayıtlı.")
@@ -44,14 +51,13 @@ async def register_user(
         last_name=user_data.last_name,
         username=user_data.username,
         email=str(user_data.email),
-        password=hash_password(user_data.password)
+        password=await hash_password_async(user_data.password)
     )
 
     evt = secrets.token_hex(16)
     new_user.email_verify_token = evt
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.flush()
 
     token_payload = {"user_id": new_user.id, "evt": evt}
     token = create_token(token_payload, token_type="email_verify")
@@ -59,14 +65,16 @@ async def register_user(
 
     subject = "PortfolioApp - E-posta Doğrulama"
     body = f"Merhaba {new_user.first_name},\n\nHesabınızı aktif hale getirmek için linke tıklayın:\n{verify_link}"
-    background_tasks.add_task(send_email_async, new_user.email, subject, body)
+    enqueue_email(db, new_user.email, subject, body)
 
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 @router.get("/verify-email")
-def verify_email(token: str, db: Session = Depends(get_db)):
+async def verify_email(token: str, db: AsyncSession = Depends(get_db)):
     payload = decode_token(token, expected_type="email_verify")
-    user = db.query(User).filter_by(id=payload.get("user_id")).first()
+    user = await db.scalar(select(User).filter_by(id=payload.get("user_id")))
     if not user:
         raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı.")
     if user.is_verified:
@@ -78,31 +86,47 @@ def verify_email(token: str, db: Session = Depends(get_db)):
 
     user.is_verified = True
     user.email_verify_token = None
-    db.commit()
+    await db.commit()
+    invalidate_cached_user(user.id)
     return {"message": "E-posta başarıyla doğrulandı. Artık giriş yapabilirsiniz."}
 
 @router.post("/login")
-async def login_user(credentials: UserLogin, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
-    user = get_user_by_username_or_email(db, credentials.username_or_email)
-    if not user or not verify_password(credentials.password, user.password):
+async def login_user(credentials: UserLogin, request: Request, db: AsyncSession = Depends(get_db)):
+    await enforce_rate_limit(request, "login", credentials.username_or_email)
+    user = await get_user_by_username_or_email(db, credentials.username_or_email)
+    if not user or user.deleted_at is not None or not await verify_password_async(credentials.password, user.password):
+        AUTH_FAILURES.inc(reason="invalid_credentials")
         raise HTTPException(status_code=401, detail="Kullanıcı adı veya şifre hatalı.")
 
     if not user.is_verified:
+        AUTH_FAILURES.inc(reason="unverified")
         evt = secrets.token_hex(16)
         user.email_verify_token = evt
-        db.commit()
 
         token_payload = {"user_id": user.id, "evt": evt}
         token = create_token(token_payload, token_type="email_verify")
         verify_link = f"{FRONTEND_URL}/verify-email?token={token}"
         subject = "PortfolioApp - E-posta Doğrulama (Yeniden Gönderim)"
         body = f"Merhaba {user.first_name},\n\nHesabınızı aktif hale getirmek için linke tıklayın:\n{verify_link}"
-        background_tasks.add_task(send_email_async, user.email, subject, body)
+        enqueue_email(db, user.email, subject, body)
+
+        await db.commit()
+        invalidate_cached_user(user.id)
         return JSONResponse(
             status_code=403,
             content={"detail": "E-posta doğrulanmamış. Yeni bir doğrulama maili gönderildi."}
         )
 
+    if password_needs_rehash(user.password):
+        try:
+            user.password = await hash_password_async(credentials.password)
+        except HTTPException:
+            PASSWORD_REHASHES.inc(result="skipped")
+        else:
+            await db.commit()
+            invalidate_cached_user(user.id)
+            PASSWORD_REHASHES.inc(result="upgraded")
+
     token_payload = {"user_id": user.id, "email": user.email, "username": user.username}
     access_token = create_token(token_payload, token_type="access")
 
@@ -113,11 +137,12 @@ async def login_user(credentials: UserLogin, background_tasks: BackgroundTasks,
 
 @router.post("/forgot-password")
 async def forgot_password(
-        background_tasks: BackgroundTasks,
+        request: Request,
         email: str = Query(..., description="Şifre sıfırlama linkinin gönderileceği e-posta"),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
-    user = db.query(User).filter(User.email.ilike(email)).first()
+    await enforce_rate_limit(request, "forgot_password", email)
+    user = await db.scalar(select(User).filter(func.lower(User.email) == func.lower(email), User.deleted_at.is_(None)))
     if not user:
         raise HTTPException(status_code=404, detail="Bu e-posta ile kayıtlı kullanıcı bulunamadı.")
 
@@ -127,44 +152,54 @@ async def forgot_password(
 
     subject = "PortfolioApp - Şifre Sıfırlama"
     body = f"Merhaba {user.first_name},\n\nŞifrenizi sıfırlamak için linke tıklayın:\n{reset_link}"
-    background_tasks.add_task(send_email_async, str(user.email), subject, body)
+    enqueue_email(db, user.email, subject, body)
+    await db.commit()
     return {"message": "Şifre sıfırlama bağlantısı e-posta adresinize gönderildi."}
 
 @router.post("/reset-password")
 async def reset_password(
         token: str = Query(..., description="Şifre sıfırlama token’ı"),
         new_password: str = Query(..., description="Yeni şifre"),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     payload = decode_token(token, expected_type="password_reset")
-    user = db.query(User).filter_by(id=payload.get("user_id")).first()
+    user = await db.scalar(select(User).filter(User.id == payload.get("user_id"), User.deleted_at.is_(None)))
     if not user:
         raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı.")
 
-    user.password = hash_password(new_password)
-    db.commit()
+    user.password = await hash_password_async(new_password)
 
     subject = "PortfolioApp - Şifreniz Güncellendi"
     body = f"Merhaba {user.first_name},\n\nŞifreniz başarıyla güncellendi."
-    await send_email_async(str(user.email), subject, body)
+    enqueue_email(db, user.email, subject, body)
+
+    await db.commit()
+    invalidate_cached_user(user.id)
     return {"message": "Şifreniz başarıyla güncellendi."}
 
 @router.post("/change-password")
 async def change_password(
         current_password: str = Query(..., description="Mevcut şifre"),
         new_password: str = Query(..., description="Yeni şifre"),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ):
-    if not verify_password(current_password, current_user.password):
+    current_matches, new_matches = await asyncio.gather(
+        verify_password_async(current_password, current_user.password),
+        verify_password_async(new_password, current_user.password)
+    )
+    if not current_matches:
+        AUTH_FAILURES.inc(reason="wrong_password")
         raise HTTPException(status_code=401, detail="Mevcut şifre hatalı.")
-    if verify_password(new_password, current_user.password):
+    if new_matches:
         raise HTTPException(status_code=400, detail="Yeni şifre mevcut şifreyle aynı olamaz.")
 
-    current_user.password = hash_password(new_password)
-    db.commit()
+    current_user.password = await hash_password_async(new_password)
 
     subject = "PortfolioApp - Şifreniz Değiştirildi"
     body = f"Merhaba {current_user.first_name},\n\nŞifreniz başarıyla değiştirildi."
-    await send_email_async(current_user.email, subject, body)
+    enqueue_email(db, current_user.email, subject, body)
+
+    await db.commit()
+    invalidate_cached_user(current_user.id)
     return {"message": "Şifreniz başarıyla güncellendi."}
\ No newline at end of file
@@ -1,67 +1,224 @@
 # routers/portfolios.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PORTFOLIO_BATCH_MAX_ITEMS
 from core.database import get_db
-from core.dependencies import get_current_user
+from core.dependencies import get_current_user, get_read_db
+from core.responses import fast_json_response
+from core.query_budget import query_budget
+from core.timing import TimedRoute
 from schemas.portfolio_schema import (
     PortfolioCreate,
     PortfolioUpdate,
     PortfolioResponse,
-    PortfolioDetailResponse
+    PortfolioDetailResponse,
+    PortfolioSearchResult,
+    PortfolioBatchUpdateItem,
+    PortfolioBatchDelete,
+    PortfolioBatchItemResult,
+    PortfolioListItem
 )
 from models.portfolio import Portfolio
+from models.user import User
+from helpers.http_cache import check_conditional, make_etag
+from helpers.pagination import (
+    NEXT_CURSOR_HEADER, paginate, stream_ndjson, encode_offset_cursor, decode_offset_cursor
+)
+from helpers.search import search_portfolio_hits
+from helpers.projection import FIELDS_DESCRIPTION, parse_portfolio_fields, portfolio_load_options, project_portfolio
+from helpers.portfolio_batch import batch_create_portfolios, batch_update_portfolios, batch_delete_portfolios
+
+router = APIRouter(prefix="/portfolios", tags=["Portfolios"], route_class=TimedRoute)
+
+def _row_version(model):
+    return func.coalesce(model.updated_at, model.created_at)
 
-router = APIRouter(prefix="/portfolios", tags=["Portfolios"])
+def _public_portfolios():
+    return select(Portfolio).filter(Portfolio.user.has(User.deleted_at.is_(None)))
+
+async def _list_version(db: AsyncSession, request: Request, *filters) -> tuple[str, object]:
+    count, portfolio_version, user_version = (await db.execute(
+        select(func.count(Portfolio.id), func.max(_row_version(Portfolio)), func.max(_row_version(User)))
+        .join(Portfolio.user)
+        .filter(User.deleted_at.is_(None), *filters)
+    )).one()
+    versions = [version for version in (portfolio_version, user_version) if version is not None]
+    etag = make_etag("portfolios", count, portfolio_version, user_version, request.url.query)
+    return etag, max(versions) if versions else None
 
 @router.post("/", response_model=PortfolioResponse, status_code=status.HTTP_201_CREATED)
-def create_portfolio(
+async def create_portfolio(
         portfolio_data: PortfolioCreate,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         current_user=Depends(get_current_user)
 ):
     new_portfolio_data = portfolio_data.model_dump()
     new_portfolio = Portfolio(**new_portfolio_data, user_id=current_user.id)
 
     db.add(new_portfolio)
-    db.commit()
-    db.refresh(new_portfolio)
+    await db.commit()
+    await db.refresh(new_portfolio)
     return new_portfolio
 
-@router.get("/my_portfolios", response_model=list[PortfolioResponse])
-def get_my_portfolios(
-        db: Session = Depends(get_db),
+@router.post("/batch", response_model=list[PortfolioBatchItemResult])
+@query_budget(3)
+async def create_portfolios_batch(
+        items: list[PortfolioCreate] = Body(..., min_length=1, max_length=PORTFOLIO_BATCH_MAX_ITEMS),
+        db: AsyncSession = Depends(get_db),
+        current_user=Depends(get_current_user)
+):
+    rows = [{**item.model_dump(), "user_id": current_user.id} for item in items]
+    return await batch_create_portfolios(db, rows)
+
+@router.put("/batch", response_model=list[PortfolioBatchItemResult])
+@query_budget(4)
+async def update_portfolios_batch(
+        items: list[PortfolioBatchUpdateItem] = Body(..., min_length=1, max_length=PORTFOLIO_BATCH_MAX_ITEMS),
+        db: AsyncSession = Depends(get_db),
+        current_user=Depends(get_current_user)
+):
+    return await batch_update_portfolios(db, items, owner_id=current_user.id)
+
+@router.delete("/batch", response_model=list[PortfolioBatchItemResult])
+@query_budget(2)
+async def delete_portfolios_batch(
+        batch: PortfolioBatchDelete,
+        db: AsyncSession = Depends(get_db),
         current_user=Depends(get_current_user)
 ):
-    portfolios = db.query(Portfolio).filter(Portfolio.user_id == current_user.id).all()
-    return portfolios
+    return await batch_delete_portfolios(db, batch.ids, owner_id=current_user.id)
+
+async def _list_portfolios(
+        db: AsyncSession,
+        response: Response,
+        stmt,
+        fields: tuple[list[str], list[str]],
+        cursor: str | None,
+        limit: int,
+        stream: bool
+):
+    stmt = stmt.options(*portfolio_load_options(*fields))
 
-@router.get("/all_portfolios", response_model=list[PortfolioDetailResponse])
-def list_all_portfolios(db: Session = Depends(get_db)):
-    portfolios = db.query(Portfolio).options(joinedload(Portfolio.user)).all()
-    return portfolios
+    def project(portfolio):
+        return project_portfolio(portfolio, *fields)
+
+    if stream:
+        return stream_ndjson(stmt, Portfolio, PortfolioListItem, cursor, project, bind=db.bind)
+    rows = await paginate(db, stmt, Portfolio, cursor, limit, response)
+    return fast_json_response([project(portfolio) for portfolio in rows], response)
+
+@router.get("/my_portfolios", response_model=list[PortfolioListItem], response_model_exclude_unset=True)
+@query_budget(2)
+async def get_my_portfolios(
+        response: Response,
+        cursor: str | None = Query(None, description="Önceki sayfanın X-Next-Cursor değeri"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        stream: bool = Query(False, description="Tüm kayıtları NDJSON olarak akıt"),
+        fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+        db: AsyncSession = Depends(get_read_db),
+        current_user=Depends(get_current_user)
+):
+    stmt = select(Portfolio).filter(Portfolio.user_id == current_user.id)
+    return await _list_portfolios(
+        db, response, stmt, parse_portfolio_fields(fields, include_user=False), cursor, limit, stream
+    )
+
+@router.get("/all_portfolios", response_model=list[PortfolioListItem], response_model_exclude_unset=True)
+@query_budget(2)
+async def list_all_portfolios(
+        request: Request,
+        response: Response,
+        cursor: str | None = Query(None, description="Önceki sayfanın X-Next-Cursor değeri"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        stream: bool = Query(False, description="Tüm kayıtları NDJSON olarak akıt"),
+        fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+        db: AsyncSession = Depends(get_read_db)
+):
+    projection = parse_portfolio_fields(fields, include_user=True)
+
+    if not stream:
+        etag, last_modified = await _list_version(db, request)
+        not_modified = check_conditional(request, response, etag, last_modified)
+        if not_modified:
+            return not_modified
+    return await _list_portfolios(db, response, _public_portfolios(), projection, cursor, limit, stream)
+
+@router.get("/search", response_model=list[PortfolioSearchResult])
+@query_budget(2)
+async def search_portfolios(
+        response: Response,
+        q: str = Query(..., min_length=1, max_length=200, description="Başlık, açıklama ve detayda aranacak ifade"),
+        cursor: str | None = Query(None, description="Önceki sayfanın X-Next-Cursor değeri"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_read_db)
+):
+    offset = decode_offset_cursor(cursor) if cursor else 0
+    hits = await search_portfolio_hits(db, q, limit + 1, offset)
+    if len(hits) > limit:
+        hits = hits[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_offset_cursor(offset + limit)
+    if not hits:
+        return []
+
+    result = await db.scalars(
+        select(Portfolio)
+        .options(joinedload(Portfolio.user))
+        .filter(Portfolio.id.in_([portfolio_id for portfolio_id, _, _ in hits]))
+    )
+    portfolios = {portfolio.id: portfolio for portfolio in result}
+
+    return [
+        PortfolioSearchResult.model_validate(portfolios[portfolio_id]).model_copy(
+            update={"score": score, "snippet": snippet}
+        )
+        for portfolio_id, score, snippet in hits
+        if portfolio_id in portfolios
+    ]
 
 @router.get("/{portfolio_id:int}", response_model=PortfolioDetailResponse)
-def get_portfolio_detail(
+@query_budget(2)
+async def get_portfolio_detail(
         portfolio_id: int,
-        db: Session = Depends(get_db),
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_read_db),
 ):
-    portfolio = db.query(Portfolio).options(joinedload(Portfolio.user)).filter(Portfolio.id == portfolio_id).first()
+    version = (await db.execute(
+        select(_row_version(Portfolio), _row_version(User))
+        .join(Portfolio.user)
+        .filter(Portfolio.id == portfolio_id, User.deleted_at.is_(None))
+    )).first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Portfolio bulunamadı.")
+
+    etag = make_etag("portfolio", portfolio_id, *version)
+    not_modified = check_conditional(request, response, etag, max(version))
+    if not_modified:
+        return not_modified
+
+    portfolio = await db.scalar(
+        select(Portfolio).options(joinedload(Portfolio.user)).filter(Portfolio.id == portfolio_id)
+    )
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio bulunamadı.")
     return portfolio
 
 @router.put("/{portfolio_id:int}", response_model=PortfolioResponse)
-def update_portfolio(
+async def update_portfolio(
         portfolio_id: int,
         portfolio_data: PortfolioUpdate,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         current_user=Depends(get_current_user)
 ):
-    portfolio = db.query(Portfolio).filter(
-        Portfolio.id == portfolio_id,
-        Portfolio.user_id == current_user.id
-    ).first()
+    portfolio = await db.scalar(
+        select(Portfolio).filter(
+            Portfolio.id == portfolio_id,
+            Portfolio.user_id == current_user.id
+        )
+    )
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio bulunamadı.")
 
@@ -69,36 +226,47 @@ def update_portfolio(
     for key, value in update_data.items():
         setattr(portfolio, key, value)
 
-    db.commit()
-    db.refresh(portfolio)
+    await db.commit()
+    await db.refresh(portfolio)
     return portfolio
 
 @router.delete("/{portfolio_id:int}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_portfolio(
+async def delete_portfolio(
         portfolio_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         current_user=Depends(get_current_user)
 ):
-    portfolio = db.query(Portfolio).filter(
-        Portfolio.id == portfolio_id,
-        Portfolio.user_id == current_user.id
-    ).first()
+    portfolio = await db.scalar(
+        select(Portfolio).filter(
+            Portfolio.id == portfolio_id,
+            Portfolio.user_id == current_user.id
+        )
+    )
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio bulunamadı.")
 
-    db.delete(portfolio)
-    db.commit()
+    await db.delete(portfolio)
+    await db.commit()
     return None
 
-@router.get("/user/{user_id:int}", response_model=list[PortfolioDetailResponse])
-def list_user_portfolios_by_id(
+@router.get("/user/{user_id:int}", response_model=list[PortfolioListItem], response_model_exclude_unset=True)
+@query_budget(2)
+async def list_user_portfolios_by_id(
         user_id: int,
-        db: Session = Depends(get_db),
+        request: Request,
+        response: Response,
+        cursor: str | None = Query(None, description="Önceki sayfanın X-Next-Cursor değeri"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        stream: bool = Query(False, description="Tüm kayıtları NDJSON olarak akıt"),
+        fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+        db: AsyncSession = Depends(get_read_db),
 ):
-    portfolios = (
-        db.query(Portfolio)
-        .options(joinedload(Portfolio.user))
-        .filter(Portfolio.user_id == user_id)
-        .all()
-    )
-    return portfolios
\ No newline at end of file
+    projection = parse_portfolio_fields(fields, include_user=True)
+    stmt = _public_portfolios().filter(Portfolio.user_id == user_id)
+
+    if not stream:
+        etag, last_modified = await _list_version(db, request, Portfolio.user_id == user_id)
+        not_modified = check_conditional(request, response, etag, last_modified)
+        if not_modified:
+            return not_modified
+    return await _list_portfolios(db, response, stmt, projection, cursor, limit, stream)
@@ -1,29 +1,38 @@
 # routers/users.py
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import secrets
 from core.database import get_db
-from core.dependencies import get_current_user
+from core.dependencies import get_current_user, get_read_db, invalidate_cached_user
 from schemas.user_schema import UserUpdate, UserResponse
+from schemas.portfolio_schema import UserProfileResponse
 from models.user import User
 from models.portfolio import Portfolio
 from core.security import create_token, decode_token
-from helpers.email_sender import send_email_async
-from core.config import FRONTEND_URL
-
-router = APIRouter(prefix="/users", tags=["Users"])
+from helpers.account_purge import account_purger, remove_account
+from helpers.email_sender import enqueue_email
+from helpers.http_cache import check_conditional, make_etag
+from helpers.pagination import paginate
+from helpers.projection import FIELDS_DESCRIPTION, LIST_FIELDS, parse_portfolio_fields, portfolio_load_options, project_portfolio
+from core.config import FRONTEND_URL, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from core.responses import fast_json_response
+from core.query_budget import query_budget
+from core.timing import TimedRoute
+
+router = APIRouter(prefix="/users", tags=["Users"], route_class=TimedRoute)
 
 @router.get("/me", response_model=UserResponse)
-def get_my_profile(current_user: User = Depends(get_current_user)):
+@query_budget(1)
+async def get_my_profile(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.put("/me", response_model=UserResponse)
 async def update_my_profile(
         user_update: UserUpdate,
-        background_tasks: BackgroundTasks,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ):
     updated = False
@@ -37,7 +46,9 @@ async def update_my_profile(
         updated = True
 
     if user_update.username:
-        existing_user = db.query(User).filter_by(username=user_update.username).first()
+        existing_user = await db.scalar(
+            select(User).filter(func.lower(User.username) == func.lower(user_update.username))
+        )
         if existing_user and existing_user.id != current_user.id:
             raise HTTPException(status_code=400, detail="Bu kullanıcı adı zaten kullanılıyor.")
         current_user.username = user_update.username
@@ -45,7 +56,9 @@ async def update_my_profile(
 
     if user_update.email:
         email_str = str(user_update.email)
-        existing_email_user = db.query(User).filter(User.email.ilike(email_str)).first()
+        existing_email_user = await db.scalar(
+            select(User).filter(func.lower(User.email) == func.lower(email_str))
+        )
         if existing_email_user and existing_email_user.id != current_user.id:
             raise HTTPException(status_code=400, detail="Bu e-posta zaten kullanılıyor.")
 
@@ -60,9 +73,6 @@ async def update_my_profile(
     if not updated:
         raise HTTPException(status_code=400, detail="Güncellenecek bir bilgi bulunamadı.")
 
-    db.commit()
-    db.refresh(current_user)
-
     if email_changed:
         token_payload = {"user_id": current_user.id, "evt": current_user.email_verify_token}
         token = create_token(token_payload, token_type="email_verify")
@@ -70,8 +80,13 @@ async def update_my_profile(
 
         subject = "PortfolioApp - Yeni E-posta Doğrulama"
         body = f"Merhaba {current_user.first_name},\n\nYeni e-posta adresinizi doğrulamak için linke tıklayın:\n{verify_link}"
-        background_tasks.add_task(send_email_async, current_user.email, subject, body)
+        enqueue_email(db, current_user.email, subject, body)
+
+    await db.commit()
+    await db.refresh(current_user)
+    invalidate_cached_user(current_user.id)
 
+    if email_changed:
         return JSONResponse(
             status_code=202,
             content={
@@ -84,7 +99,7 @@ async def update_my_profile(
 
 @router.post("/request-delete")
 async def request_account_deletion(
-        background_tasks: BackgroundTasks,
+        db: AsyncSession = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ):
     token_payload = {"user_id": current_user.id}
@@ -93,35 +108,74 @@ async def request_account_deletion(
 
     subject = "PortfolioApp - Hesap Silme Onayı"
     body = f"Merhaba {current_user.first_name},\n\nHesabınızı silme işlemini onaylamak için linke tıklayın:\n{delete_link}"
-    background_tasks.add_task(send_email_async, current_user.email, subject, body)
+    enqueue_email(db, current_user.email, subject, body)
+    await db.commit()
     return {"message": "Hesap silme onay maili gönderildi."}
 
 @router.get("/confirm-delete")
-async def confirm_account_deletion(token: str, db: Session = Depends(get_db)):
+async def confirm_account_deletion(token: str, db: AsyncSession = Depends(get_db)):
     payload = decode_token(token, expected_type="account_delete")
-    user = db.query(User).filter_by(id=payload.get("user_id")).first()
-    if not user:
+    user = await db.scalar(select(User).filter_by(id=payload.get("user_id")))
+    if not user or user.deleted_at is not None:
         raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı.")
 
-    email = user.email
-    first_name = user.first_name
-
-    db.query(Portfolio).filter_by(user_id=user.id).delete()
-    db.delete(user)
-    db.commit()
-
     subject = "PortfolioApp - Hesabınız Silindi"
-    body = f"Merhaba {first_name},\n\nHesabınız ve tüm verileriniz başarıyla silindi."
-    await send_email_async(str(email), subject, body)
+    body = f"Merhaba {user.first_name},\n\nHesabınız ve tüm verileriniz başarıyla silindi."
+    enqueue_email(db, user.email, subject, body)
+
+    user_id = user.id
+    await remove_account(db, user)
+    await db.commit()
+    invalidate_cached_user(user_id)
+    account_purger.notify()
 
     return {"message": "Hesabınız ve portfolyolarınız başarıyla silindi."}
 
 @router.get("/{username}", response_model=UserResponse)
-def get_user_by_username(
+@query_budget(1)
+async def get_user_by_username(
         username: str,
-        db: Session = Depends(get_db)
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_read_db)
 ):
-    user = db.query(User).filter(User.username.ilike(username)).first()
+    user = await db.scalar(
+        select(User).filter(func.lower(User.username) == func.lower(username), User.deleted_at.is_(None))
+    )
     if not user:
         raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı.")
-    return user
\ No newline at end of file
+
+    last_modified = user.updated_at or user.created_at
+    etag = make_etag("user", user.id, last_modified)
+    not_modified = check_conditional(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    return user
+
+@router.get("/{username}/profile", response_model=UserProfileResponse, response_model_exclude_unset=True)
+@query_budget(2)
+async def get_user_profile(
+        username: str,
+        response: Response,
+        cursor: str | None = Query(None, description="Önceki sayfanın X-Next-Cursor değeri"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+        db: AsyncSession = Depends(get_read_db)
+):
+    portfolio_fields = parse_portfolio_fields(fields, include_user=False)[0] if fields else list(LIST_FIELDS)
+
+    user = await db.scalar(
+        select(User).filter(func.lower(User.username) == func.lower(username), User.deleted_at.is_(None))
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı.")
+
+    portfolios = await paginate(
+        db,
+        select(Portfolio).options(*portfolio_load_options(portfolio_fields, [])).filter(Portfolio.user_id == user.id),
+        Portfolio, cursor, limit, response
+    )
+    return fast_json_response({
+        "user": {name: getattr(user, name) for name in UserResponse.model_fields},
+        "portfolios": [project_portfolio(portfolio, portfolio_fields, []) for portfolio in portfolios],
+    }, response)
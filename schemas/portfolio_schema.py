@@ -1,8 +1,10 @@
 # schemas/portfolio_schema.py
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
+from core.config import PORTFOLIO_BATCH_MAX_ITEMS
+from schemas.user_schema import StoredEmail, UserResponse
 
 class PortfolioBase(BaseModel):
     title: str
@@ -19,6 +21,15 @@ class PortfolioUpdate(BaseModel):
     detail: Optional[str] = None
     link: Optional[str] = None
 
+class AdminPortfolioCreate(PortfolioCreate):
+    user_id: int
+
+class PortfolioBatchUpdateItem(PortfolioUpdate):
+    id: int
+
+class PortfolioBatchDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=PORTFOLIO_BATCH_MAX_ITEMS)
+
 class PortfolioResponseBase(BaseModel):
     id: int
     title: str
@@ -37,10 +48,41 @@ class PortfolioResponse(PortfolioResponseBase):
 class PortfolioUserResponse(BaseModel):
     id: int
     username: str
-    email: EmailStr
+    email: StoredEmail
 
     class Config:
         from_attributes = True
 
 class PortfolioDetailResponse(PortfolioResponseBase):
-    user: PortfolioUserResponse
\ No newline at end of file
+    user: PortfolioUserResponse
+
+class PortfolioListUser(BaseModel):
+    id: int
+    username: Optional[str] = None
+    email: Optional[StoredEmail] = None
+
+class PortfolioListItem(BaseModel):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    detail: Optional[str] = None
+    link: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    user_id: Optional[int] = None
+    user: Optional[PortfolioListUser] = None
+
+class PortfolioSearchResult(PortfolioDetailResponse):
+    score: float = 0.0
+    snippet: Optional[str] = None
+
+class PortfolioBatchItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: str
+    detail: Optional[str] = None
+    portfolio: Optional[PortfolioResponse] = None
+
+class UserProfileResponse(BaseModel):
+    user: UserResponse
+    portfolios: list[PortfolioListItem]
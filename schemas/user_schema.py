@@ -1,8 +1,10 @@
 # schemas/user_schema.py
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, WithJsonSchema
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
+
+StoredEmail = Annotated[str, WithJsonSchema({"type": "string", "format": "email"})]
 
 class UserCreate(BaseModel):
     first_name: str = Field(..., min_length=2, max_length=50)
@@ -20,7 +22,7 @@ class UserResponse(BaseModel):
     first_name: str
     last_name: str
     username: str
-    email: EmailStr
+    email: StoredEmail
     is_admin: bool
     is_verified: bool
     created_at: datetime
@@ -29,6 +31,10 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class AdminUserListItem(UserResponse):
+    portfolio_count: int = 0
+    last_portfolio_at: Optional[datetime] = None
+
 class UserUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
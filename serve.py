@@ -0,0 +1,57 @@
+# serve.py
+
+import argparse
+import importlib.util
+import os
+import uvicorn
+from core.config import (
+    SERVER_HOST, SERVER_PORT, SERVER_WORKERS, SERVER_BACKLOG, SERVER_KEEP_ALIVE_SECONDS,
+    SERVER_GRACEFUL_TIMEOUT_SECONDS, SERVER_LIMIT_CONCURRENCY, SERVER_FORWARDED_ALLOW_IPS, SERVER_ACCESS_LOG,
+    PASSWORD_HASH_CALIBRATE
+)
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio Backend üretim sunucusu")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument("--migrate", action="store_true", help="Worker'lar başlamadan önce migration'ları uygula")
+    args = parser.parse_args()
+
+    if args.migrate:
+        from migrations import run_migrations
+        for version in run_migrations():
+            print(f"✅ Uygulandı: {version}")
+
+    if PASSWORD_HASH_CALIBRATE:
+        from core.security import calibrate_password_hashing
+        print(f"🔐 Şifre hash maliyeti: {calibrate_password_hashing()} tur (tüm worker'lar bu değeri kullanır)")
+
+    os.environ.setdefault("HASH_WORKERS", str(max(1, (os.cpu_count() or 1) // args.workers)))
+
+    loop = "uvloop" if _installed("uvloop") else "asyncio"
+    http = "httptools" if _installed("httptools") else "h11"
+    print(f"🚀 {args.host}:{args.port} üzerinde {args.workers} worker başlatılıyor (loop={loop}, http={http})")
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        limit_concurrency=SERVER_LIMIT_CONCURRENCY or None,
+        proxy_headers=True,
+        forwarded_allow_ips=SERVER_FORWARDED_ALLOW_IPS,
+        access_log=SERVER_ACCESS_LOG,
+        server_header=False,
+    )
+
+if __name__ == "__main__":
+    main()
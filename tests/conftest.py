@@ -0,0 +1,121 @@
+# tests/conftest.py
+
+import asyncio
+import os
+import socket
+import tempfile
+
+import pytest
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+_DIRECTORY = tempfile.mkdtemp(prefix="portfolio-tests-")
+PRIMARY_URL = f"sqlite:///{_DIRECTORY}/primary.db"
+REPLICA_URL = f"sqlite:///{_DIRECTORY}/replica.db"
+
+os.environ.update(
+    SECRET_KEY="test-secret-key-with-enough-length",
+    ALGORITHM="HS256",
+    ACCESS_TOKEN_EXPIRE_MINUTES="60",
+    DATABASE_URL=PRIMARY_URL,
+    DATABASE_REPLICA_URLS=REPLICA_URL,
+    FRONTEND_URL="http://frontend.test",
+    BASE_URL="http://api.test",
+    SMTP_SERVER="127.0.0.1",
+    SMTP_PORT=str(_free_port()),
+    SMTP_USER="",
+    SMTP_PASS="",
+    SMTP_START_TLS="false",
+    SENDER_NAME="Portfolio",
+    SENDER_EMAIL="noreply@portfolio.test",
+    EMAIL_DISPATCHER_ENABLED="false",
+    QUERY_BUDGET_MODE="raise",
+    RATE_LIMIT_ENABLED="false",
+    PASSWORD_HASH_ROUNDS="1000",
+    HASH_WORKERS="1",
+)
+
+from sqlalchemy import create_engine, delete  # noqa: E402
+from migrations import run_migrations  # noqa: E402
+
+run_migrations()
+_replica_engine = create_engine(REPLICA_URL)
+run_migrations(_replica_engine)
+_replica_engine.dispose()
+
+@pytest.fixture
+def run():
+    from core.database import dispose_engines
+
+    def run_coroutine(coro):
+        async def runner():
+            try:
+                return await coro
+            finally:
+                await dispose_engines()
+
+        return asyncio.run(runner())
+
+    return run_coroutine
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def make_user():
+    from core.database import SessionLocal
+    from core.security import create_token
+    from models.user import User
+
+    def create(username: str, **values) -> tuple[int, dict]:
+        with SessionLocal() as db:
+            user = User(
+                first_name="Test", last_name="User", username=username, email=f"{username}@portfolio.test",
+                password="unused", is_verified=True, **values
+            )
+            db.add(user)
+            db.commit()
+            token = create_token(
+                {"user_id": user.id, "email": user.email, "username": user.username}, token_type="access"
+            )
+            return user.id, {"Authorization": f"Bearer {token}"}
+
+    return create
+
+@pytest.fixture
+def replica_session():
+    from sqlalchemy.orm import sessionmaker
+    from models.portfolio import Portfolio
+    from models.user import User
+
+    engine = create_engine(REPLICA_URL)
+    yield sessionmaker(bind=engine)
+    with engine.begin() as connection:
+        for model in (Portfolio, User):
+            connection.execute(delete(model))
+    engine.dispose()
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    yield
+    from core.database import SessionLocal
+    from core.dependencies import user_cache
+    from core.security import token_cache
+    from models.email_outbox import EmailOutbox
+    from models.portfolio import Portfolio
+    from models.user import User
+
+    with SessionLocal() as db:
+        for model in (Portfolio, User, EmailOutbox):
+            db.execute(delete(model))
+        db.commit()
+    user_cache.clear()
+    token_cache.clear()
@@ -0,0 +1,41 @@
+# tests/test_admin_users.py
+
+import time
+
+from sqlalchemy import update
+
+from core.database import SessionLocal
+from core.read_routing import LAST_WRITE_HEADER
+from models.portfolio import Portfolio
+from models.user import User
+
+def test_update_rejects_case_insensitive_username_clash(client, make_user):
+    _, headers = make_user("admin", is_admin=True)
+    alice_id, _ = make_user("Alice")
+    with SessionLocal() as db:
+        db.execute(update(User).filter(User.id == alice_id).values(email="alice@example.com"))
+        db.commit()
+    user_id, _ = make_user("bob")
+
+    clash = client.put(f"/admin/users/{user_id}", headers=headers, json={"username": "alice"})
+    email_clash = client.put(f"/admin/users/{user_id}", headers=headers, json={"email": "ALICE@example.com"})
+    own = client.put(f"/admin/users/{user_id}", headers=headers, json={"username": "Bob"})
+
+    assert clash.status_code == 400
+    assert clash.json()["detail"] == "Bu e-posta veya kullanıcı adı zaten mevcut."
+    assert email_clash.status_code == 400
+    assert own.status_code == 200
+    assert own.json()["username"] == "Bob"
+
+def test_user_list_includes_portfolio_stats(client, make_user):
+    admin_id, headers = make_user("admin", is_admin=True)
+    with SessionLocal() as db:
+        db.add_all([Portfolio(title=f"t{index}", description="d", user_id=admin_id) for index in range(2)])
+        db.commit()
+
+    response = client.get("/admin/users", headers={**headers, LAST_WRITE_HEADER: str(time.time())})
+
+    assert response.status_code == 200
+    (item,) = response.json()
+    assert (item["username"], item["portfolio_count"]) == ("admin", 2)
+    assert item["last_portfolio_at"] is not None
@@ -0,0 +1,19 @@
+# tests/test_auth.py
+
+from datetime import timedelta
+
+from core.database import get_istanbul_now
+from core.security import create_token
+
+def _reset_token(user_id: int) -> str:
+    return create_token({"user_id": user_id}, token_type="password_reset", expires_delta=timedelta(hours=1))
+
+def test_reset_password_ignores_soft_deleted_account(client, make_user):
+    active_id, _ = make_user("active")
+    deleted_id, _ = make_user("deleted", deleted_at=get_istanbul_now())
+
+    deleted = client.post("/auth/reset-password", params={"token": _reset_token(deleted_id), "new_password": "yenisifre"})
+    active = client.post("/auth/reset-password", params={"token": _reset_token(active_id), "new_password": "yenisifre"})
+
+    assert deleted.status_code == 404
+    assert active.status_code == 200
@@ -0,0 +1,112 @@
+# tests/test_email_outbox.py
+
+from datetime import timedelta
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select, update
+
+from core.config import EMAIL_MAX_ATTEMPTS, SMTP_PORT, SMTP_SERVER
+from core.database import AsyncSessionLocal, get_istanbul_now
+from helpers.email_sender import EmailDispatcher, enqueue_email
+from models.email_outbox import EmailOutbox
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((session.peer, envelope.rcpt_tos, envelope.content.decode()))
+        return "250 OK"
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname=SMTP_SERVER, port=SMTP_PORT)
+    controller.start()
+    yield handler
+    controller.stop()
+
+async def _enqueue(count: int):
+    async with AsyncSessionLocal() as db:
+        for index in range(count):
+            enqueue_email(db, f"user{index}@portfolio.test", f"Konu {index}", f"İçerik {index}")
+        await db.commit()
+
+async def _rows() -> list[EmailOutbox]:
+    async with AsyncSessionLocal() as db:
+        return (await db.scalars(select(EmailOutbox).order_by(EmailOutbox.id))).all()
+
+async def _dispatch() -> int:
+    dispatcher = EmailDispatcher()
+    try:
+        return await dispatcher.dispatch_once()
+    finally:
+        await dispatcher._disconnect()
+
+def test_dispatcher_sends_batch_over_one_connection(run, smtp_server):
+    async def scenario():
+        await _enqueue(3)
+        processed = await _dispatch()
+        return processed, await _rows()
+
+    processed, rows = run(scenario())
+
+    assert processed == 3
+    assert [row.status for row in rows] == ["sent"] * 3
+    assert all(row.sent_at is not None and row.claim_token is None for row in rows)
+    assert sorted(rcpt for _, (rcpt,), _ in smtp_server.messages) == [
+        "user0@portfolio.test", "user1@portfolio.test", "user2@portfolio.test"
+    ]
+    assert len({peer for peer, _, _ in smtp_server.messages}) == 1
+    assert "Subject: Konu 0" in smtp_server.messages[0][2]
+
+def test_dispatcher_leaves_nothing_to_claim_after_sending(run, smtp_server):
+    async def scenario():
+        await _enqueue(2)
+        return await _dispatch(), await _dispatch()
+
+    assert run(scenario()) == (2, 0)
+    assert len(smtp_server.messages) == 2
+
+def test_unreachable_server_schedules_retry(run):
+    async def scenario():
+        await _enqueue(1)
+        processed = await _dispatch()
+        return processed, await _rows()
+
+    processed, (row,) = run(scenario())
+
+    assert processed == 1
+    assert row.status == "pending"
+    assert row.attempts == 1
+    assert row.last_error.startswith("connect:")
+    assert row.claim_token is None
+    assert row.next_attempt_at.replace(tzinfo=None) > get_istanbul_now().replace(tzinfo=None)
+
+def test_last_attempt_marks_email_failed(run):
+    async def scenario():
+        await _enqueue(1)
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(EmailOutbox).values(
+                attempts=EMAIL_MAX_ATTEMPTS - 1, next_attempt_at=get_istanbul_now() - timedelta(seconds=1)
+            ))
+            await db.commit()
+        await _dispatch()
+        return await _rows()
+
+    (row,) = run(scenario())
+
+    assert row.status == "failed"
+    assert row.attempts == EMAIL_MAX_ATTEMPTS
+
+def test_due_rows_wait_for_retry_delay(run, smtp_server):
+    async def scenario():
+        await _enqueue(1)
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(EmailOutbox).values(next_attempt_at=get_istanbul_now() + timedelta(minutes=5)))
+            await db.commit()
+        return await _dispatch()
+
+    assert run(scenario()) == 0
+    assert smtp_server.messages == []
@@ -0,0 +1,53 @@
+# tests/test_migrations.py
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from migrations import run_migrations
+
+_BASELINE_USERS = (
+    "CREATE TABLE users ("
+    "id INTEGER PRIMARY KEY, first_name VARCHAR(50) NOT NULL, last_name VARCHAR(50) NOT NULL, "
+    "username VARCHAR(50) NOT NULL UNIQUE, email VARCHAR(120) NOT NULL UNIQUE, password VARCHAR(255) NOT NULL, "
+    "is_admin BOOLEAN, is_verified BOOLEAN, email_verify_token VARCHAR(64), "
+    "created_at DATETIME NOT NULL, updated_at DATETIME)"
+)
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(_BASELINE_USERS))
+        conn.execute(text(
+            "INSERT INTO users (id, first_name, last_name, username, email, password, created_at) VALUES "
+            "(1, 'A', 'A', 'Alice', 'alice@portfolio.test', 'x', '2024-01-01'), "
+            "(2, 'A', 'A', 'alice', 'other@portfolio.test', 'x', '2024-01-01'), "
+            "(3, 'B', 'B', 'bob', 'Bob@Portfolio.test', 'x', '2024-01-01'), "
+            "(4, 'B', 'B', 'bobby', 'bob@portfolio.test', 'x', '2024-01-01')"
+        ))
+    yield engine
+    engine.dispose()
+
+def test_case_collisions_abort_with_user_ids(baseline_engine):
+    with pytest.raises(RuntimeError) as raised:
+        run_migrations(baseline_engine)
+
+    message = str(raised.value)
+    assert "username 'alice': 1, 2" in message
+    assert "email 'bob@portfolio.test': 3, 4" in message
+    with baseline_engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM schema_migrations")).scalar() == 0
+
+def test_migrations_run_once_collisions_are_resolved(baseline_engine):
+    with pytest.raises(RuntimeError):
+        run_migrations(baseline_engine)
+    with baseline_engine.begin() as conn:
+        conn.execute(text("UPDATE users SET username = 'alice2' WHERE id = 2"))
+        conn.execute(text("UPDATE users SET email = 'bobby@portfolio.test' WHERE id = 4"))
+
+    applied = run_migrations(baseline_engine)
+
+    assert applied[0] == "v0001_lookup_indexes"
+    assert "v0004_user_soft_delete" in applied
+    columns = {column["name"] for column in inspect(baseline_engine).get_columns("users")}
+    assert "deleted_at" in columns
@@ -0,0 +1,24 @@
+# tests/test_password_hashing.py
+
+import asyncio
+
+from core import security
+from core.config import HASH_WORKERS
+
+def test_hash_pools_share_the_hash_worker_budget():
+    assert sum(security._hash_pool_sizes.values()) == HASH_WORKERS
+    assert security._hash_pool_sizes["requests"] >= 1
+
+def test_bulk_hashing_without_import_pool_uses_request_pool():
+    async def scenario():
+        try:
+            hashes = await security.hash_passwords_async(["first", "second", "third"], slice_size=2)
+            return hashes, set(security._hash_executors)
+        finally:
+            security.shutdown_hash_executor()
+
+    hashes, pools = asyncio.run(scenario())
+
+    assert [security.verify_password(plain, hashed) for plain, hashed in zip(("first", "second", "third"), hashes)] \
+        == [True, True, True]
+    assert pools == {"requests"}
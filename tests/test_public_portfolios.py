@@ -0,0 +1,52 @@
+# tests/test_public_portfolios.py
+
+import pytest
+
+from core.database import get_istanbul_now
+from models.portfolio import Portfolio
+from models.user import User
+
+@pytest.fixture
+def portfolios(replica_session):
+    with replica_session() as db:
+        active = User(
+            first_name="Aktif", last_name="User", username="active", email="active@portfolio.test",
+            password="unused", is_verified=True
+        )
+        deleted = User(
+            first_name="Silinen", last_name="User", username="deleted", email="deleted@portfolio.test",
+            password="unused", is_verified=True, deleted_at=get_istanbul_now()
+        )
+        db.add_all([active, deleted])
+        db.flush()
+        visible = Portfolio(title="Görünür roket", description="aktif sahip", user_id=active.id)
+        hidden = Portfolio(title="Gizli roket", description="silinmiş sahip", user_id=deleted.id)
+        db.add_all([visible, hidden])
+        db.commit()
+        return {"visible": visible.id, "hidden": hidden.id, "deleted_user": deleted.id}
+
+def test_list_skips_soft_deleted_owners(client, portfolios):
+    response = client.get("/portfolios/all_portfolios")
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [portfolios["visible"]]
+
+def test_user_list_of_soft_deleted_owner_is_empty(client, portfolios):
+    response = client.get(f"/portfolios/user/{portfolios['deleted_user']}")
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+def test_detail_of_soft_deleted_owner_is_not_found(client, portfolios):
+    assert client.get(f"/portfolios/{portfolios['visible']}").status_code == 200
+    assert client.get(f"/portfolios/{portfolios['hidden']}").status_code == 404
+
+def test_search_skips_soft_deleted_owners(client, portfolios):
+    response = client.get("/portfolios/search", params={"q": "roket"})
+
+    assert response.status_code == 200
+    (hit,) = response.json()
+    assert hit["id"] == portfolios["visible"]
+    assert hit["user"]["username"] == "active"
+    assert hit["score"] != 0
+    assert "roket" in hit["snippet"]
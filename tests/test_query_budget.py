@@ -0,0 +1,113 @@
+# tests/test_query_budget.py
+
+import re
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from core.database import get_db
+from core.query_budget import QueryBudgetExceeded, enforce, fingerprint, query_budget
+from core.timing import TimedRoute, TimingMiddleware
+from models.portfolio import Portfolio
+from models.user import User
+
+def _queries(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+def _probe_app() -> FastAPI:
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/n-plus-one")
+    async def n_plus_one(db=Depends(get_db)):
+        portfolios = (await db.scalars(select(Portfolio))).all()
+        return [await db.scalar(select(User.username).filter(User.id == item.user_id)) for item in portfolios]
+
+    @router.get("/tight")
+    @query_budget(1)
+    async def tight(db=Depends(get_db)):
+        await db.scalar(select(User.id).limit(1))
+        await db.scalar(select(Portfolio.id).limit(1))
+        return "ok"
+
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware)
+    app.include_router(router)
+    return app
+
+def test_fingerprint_collapses_literals_and_in_lists():
+    assert fingerprint("SELECT * FROM users WHERE id IN (?, ?, ?) AND name = 'x'") == \
+        fingerprint("SELECT *  FROM users WHERE id IN (?, ?) AND name = 'y'")
+    assert fingerprint("SELECT * FROM portfolios WHERE id = 7") == "SELECT * FROM portfolios WHERE id = ?"
+
+def test_enforce_raises_over_budget_and_on_repeats():
+    enforce("/ok", (3, 5), 3, {"SELECT ?": 4})
+    with pytest.raises(QueryBudgetExceeded, match="bütçe 2"):
+        enforce("/over", (2, 5), 3, {})
+    with pytest.raises(QueryBudgetExceeded, match="olası N\\+1"):
+        enforce("/repeat", (50, 5), 6, {"SELECT users.username FROM users WHERE users.id = ?": 5})
+
+def test_route_over_declared_budget_fails(make_user):
+    with TestClient(_probe_app()) as client, pytest.raises(QueryBudgetExceeded, match="/tight"):
+        client.get("/tight")
+
+def test_n_plus_one_loop_is_flagged(make_user):
+    from core.database import SessionLocal
+
+    user_id, _ = make_user("budget_owner")
+    with SessionLocal() as db:
+        db.add_all([Portfolio(title=f"t{index}", description="d", user_id=user_id) for index in range(5)])
+        db.commit()
+
+    with TestClient(_probe_app()) as client, pytest.raises(QueryBudgetExceeded, match="5 kez"):
+        client.get("/n-plus-one")
+
+@pytest.mark.parametrize("prefix", ["/portfolios/batch", "/admin/portfolios/batch"])
+def test_mixed_batch_update_stays_within_budget(client, make_user, prefix):
+    from core.database import SessionLocal
+
+    user_id, headers = make_user("batch_admin", is_admin=True)
+    with SessionLocal() as db:
+        portfolios = [Portfolio(title=f"t{index}", description=f"d{index}", user_id=user_id) for index in range(4)]
+        db.add_all(portfolios)
+        db.commit()
+        ids = [portfolio.id for portfolio in portfolios]
+
+    response = client.put(prefix, headers=headers, json=[
+        {"id": ids[0], "title": "T0"},
+        {"id": ids[1], "description": "D1"},
+        {"id": ids[2], "title": "T2", "description": "D2", "link": "https://example.com"},
+        {"id": ids[3]},
+        {"id": ids[3] + 1000, "title": "missing"},
+    ])
+
+    assert response.status_code == 200
+    assert _queries(response) <= 4
+    results = response.json()
+    assert [item["status"] for item in results] == ["updated"] * 4 + ["not_found"]
+    assert [
+        (item["portfolio"]["title"], item["portfolio"]["description"], item["portfolio"]["link"])
+        for item in results[:4]
+    ] == [("T0", "d0", None), ("t1", "D1", None), ("T2", "D2", "https://example.com"), ("t3", "d3", None)]
+
+def test_batch_create_reports_each_input_at_its_index(client, make_user):
+    _, headers = make_user("batch_creator")
+    items = [
+        {"title": "same", "description": "row"},
+        {"title": "b", "description": "second", "link": "https://b.example"},
+        {"title": "same", "description": "row"},
+        {"title": "a", "description": "first"},
+    ]
+
+    response = client.post("/portfolios/batch", headers=headers, json=items)
+
+    assert response.status_code == 200
+    assert _queries(response) <= 3
+    results = response.json()
+    assert [item["index"] for item in results] == [0, 1, 2, 3]
+    assert [(item["portfolio"]["title"], item["portfolio"]["description"]) for item in results] == [
+        (item["title"], item["description"]) for item in items
+    ]
+    assert results[1]["portfolio"]["link"] == "https://b.example"
+    assert len({item["id"] for item in results}) == 4
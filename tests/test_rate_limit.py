@@ -0,0 +1,143 @@
+# tests/test_rate_limit.py
+
+import asyncio
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from core import rate_limit
+from core.rate_limit import MemoryBackend, RedisBackend, SlidingWindow, TokenBucket, enforce_rate_limit
+
+class FakeClock:
+    def __init__(self, now: float = 1200.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return MemoryBackend()
+    return RedisBackend(fakeredis.FakeAsyncRedis())
+
+def _request(host: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": [], "client": (host, 5000)})
+
+def test_sliding_window_weights_previous_window(backend, clock):
+    rule = SlidingWindow(3, 10)
+
+    async def scenario():
+        hits = [await rule.hit(backend, "ip") for _ in range(4)]
+        clock.now = 1210.0
+        hits.append(await rule.hit(backend, "ip"))
+        clock.now = 1215.0
+        hits.append(await rule.hit(backend, "ip"))
+        return hits
+
+    hits = asyncio.run(scenario())
+
+    assert hits[:3] == [0.0, 0.0, 0.0]
+    assert hits[3] == pytest.approx(10.0)
+    assert hits[4] == pytest.approx(10 / 3)
+    assert hits[5] == 0.0
+
+def test_token_bucket_refills_over_time(backend, clock):
+    rule = TokenBucket(2, 10)
+
+    async def scenario():
+        hits = [await rule.hit(backend, "user") for _ in range(3)]
+        clock.now += 5
+        hits.append(await rule.hit(backend, "user"))
+        hits.append(await rule.hit(backend, "user"))
+        return hits
+
+    hits = asyncio.run(scenario())
+
+    assert hits[:2] == [0.0, 0.0]
+    assert hits[2] == pytest.approx(5.0)
+    assert hits[3] == 0.0
+    assert hits[4] == pytest.approx(5.0)
+
+def test_keys_are_limited_independently(backend, clock):
+    rule = SlidingWindow(1, 60)
+
+    async def scenario():
+        return [await rule.hit(backend, key) for key in ("a", "b", "a")]
+
+    first, second, repeat = asyncio.run(scenario())
+
+    assert (first, second) == (0.0, 0.0)
+    assert repeat > 0
+
+def test_memory_backend_evicts_oldest_keys(clock):
+    backend = MemoryBackend(maxsize=2)
+    rule = SlidingWindow(1, 60)
+
+    async def scenario():
+        for key in ("a", "b", "c"):
+            await rule.hit(backend, key)
+        return await rule.hit(backend, "a"), await rule.hit(backend, "c")
+
+    assert asyncio.run(scenario()) == (0.0, pytest.approx(60.0))
+
+@pytest.fixture
+def limited(monkeypatch, backend, clock):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "_backend", backend)
+    monkeypatch.setitem(rate_limit.RATE_LIMITS, "login", (SlidingWindow(4, 60), TokenBucket(2, 60)))
+
+def test_enforce_rejects_with_retry_after(limited):
+    async def scenario():
+        for identifier in ("Someone@Portfolio.test", " someone@portfolio.test"):
+            await enforce_rate_limit(_request(), "login", identifier)
+        with pytest.raises(HTTPException) as raised:
+            await enforce_rate_limit(_request(), "login", "SOMEONE@portfolio.test")
+        await enforce_rate_limit(_request(), "login", "other@portfolio.test")
+        return raised.value
+
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 429
+    assert error.headers == {"Retry-After": "30"}
+    assert "30 saniye" in error.detail
+
+def test_enforce_limits_each_client_ip(limited):
+    async def scenario():
+        for index in range(4):
+            await enforce_rate_limit(_request(), "login", f"user{index}@portfolio.test")
+        await enforce_rate_limit(_request("10.0.0.2"), "login")
+        with pytest.raises(HTTPException) as raised:
+            await enforce_rate_limit(_request(), "login")
+        return raised.value
+
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 429
+    assert error.headers == {"Retry-After": "60"}
+
+def test_backend_failure_lets_request_through(monkeypatch):
+    class BrokenBackend:
+        async def sliding_window(self, key, limit, window):
+            raise ConnectionError("down")
+
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "_backend", BrokenBackend())
+    monkeypatch.setitem(rate_limit.RATE_LIMITS, "login", (SlidingWindow(1, 60), None))
+    before = rate_limit.RATE_LIMIT_BACKEND_ERRORS.value(scope="login")
+
+    asyncio.run(enforce_rate_limit(_request(), "login"))
+    asyncio.run(enforce_rate_limit(_request(), "login"))
+
+    assert rate_limit.RATE_LIMIT_BACKEND_ERRORS.value(scope="login") == before + 2
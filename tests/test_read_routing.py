@@ -0,0 +1,62 @@
+# tests/test_read_routing.py
+
+import time
+
+from core.dependencies import READ_ROUTING
+from core.read_routing import LAST_WRITE_COOKIE, LAST_WRITE_HEADER
+from core.security import AUTH_FAILURES
+
+def _routing() -> dict:
+    return {target: READ_ROUTING.value(target=target) for target in ("primary_sticky", "replica")}
+
+def _titles(response) -> list[str]:
+    assert response.status_code == 200
+    return [item["title"] for item in response.json()]
+
+def test_reads_go_to_replica_without_write_marker(client, make_user, replica_session):
+    _, headers = make_user("writer")
+    before = _routing()
+
+    created = client.post("/portfolios/", headers=headers, json={"title": "Yeni", "description": "primary"})
+    client.cookies.clear()
+    response = client.get("/portfolios/all_portfolios", headers=headers)
+
+    assert created.status_code == 201
+    assert _titles(response) == []
+    assert _routing() == {**before, "replica": before["replica"] + 1}
+
+def test_write_sets_marker_and_next_read_uses_primary(client, make_user, replica_session):
+    _, headers = make_user("writer")
+    before = _routing()
+
+    created = client.post("/portfolios/", headers=headers, json={"title": "Yeni", "description": "primary"})
+    response = client.get("/portfolios/all_portfolios")
+
+    assert created.status_code == 201
+    assert LAST_WRITE_COOKIE in created.cookies
+    assert float(created.headers[LAST_WRITE_HEADER]) <= time.time()
+    assert _titles(response) == ["Yeni"]
+    assert _routing() == {**before, "primary_sticky": before["primary_sticky"] + 1}
+
+def test_write_marker_header_routes_to_primary(client, make_user, replica_session):
+    _, headers = make_user("writer")
+    client.post("/portfolios/", headers=headers, json={"title": "Yeni", "description": "primary"})
+    client.cookies.clear()
+
+    fresh = client.get("/portfolios/all_portfolios", headers={LAST_WRITE_HEADER: str(time.time())})
+    expired = client.get("/portfolios/all_portfolios", headers={LAST_WRITE_HEADER: str(time.time() - 3600)})
+    garbage = client.get("/portfolios/all_portfolios", headers={LAST_WRITE_HEADER: "soon"})
+
+    assert _titles(fresh) == ["Yeni"]
+    assert _titles(expired) == []
+    assert _titles(garbage) == []
+
+def test_reads_do_not_set_marker_or_count_auth_failures(client, replica_session):
+    failures = AUTH_FAILURES.value(reason="invalid_token")
+
+    response = client.get("/portfolios/all_portfolios", headers={"Authorization": "Bearer not-a-token"})
+
+    assert _titles(response) == []
+    assert LAST_WRITE_HEADER not in response.headers
+    assert LAST_WRITE_COOKIE not in response.cookies
+    assert AUTH_FAILURES.value(reason="invalid_token") == failures